@@ -0,0 +1,57 @@
+"""
+Batched bootstrap AUROC against a loop of roc_auc_score calls
+
+Draws synthetic test scores for several models and times
+bootstrap.bootstrap_metrics for the full number of resamples. The loop of
+roc_auc_score calls (with the resample counts as sample weights) is timed
+on a smaller number of resamples and extrapolated, and both are checked to
+agree on those resamples.
+
+    python benchmarks/bench_bootstrap.py --rows 1000 --models 11 --resamples 10000
+"""
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from harness import use_problem
+
+use_problem('problem2')
+
+from bootstrap import bootstrap_metrics, rank_segments, resample_counts, weighted_aurocs
+
+def main():
+    parser = argparse.ArgumentParser(description='Bootstrap AUROC: batched vs loop')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--models', type=int, default=11)
+    parser.add_argument('--resamples', type=int, default=10000)
+    parser.add_argument('--loop-resamples', type=int, default=200)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    y_true = (rng.random(args.rows) < 0.14).astype(int)
+    scores = {f'model{i}': y_true * rng.uniform(0.5, 1.5) + rng.normal(size=args.rows)
+              for i in range(args.models)}
+    correct = {name: (model_scores > 0.5) == y_true for name, model_scores in scores.items()}
+
+    start = time.perf_counter()
+    bootstrap_metrics(y_true, scores, correct, args.resamples, n_jobs=args.jobs)
+    batched_seconds = time.perf_counter() - start
+
+    counts = resample_counts(args.rows, args.loop_resamples, rng)
+    start = time.perf_counter()
+    expected = {name: [roc_auc_score(y_true, model_scores, sample_weight=weights) for weights in counts.T]
+                for name, model_scores in scores.items()}
+    loop_seconds = (time.perf_counter() - start) * args.resamples / args.loop_resamples
+    batched = weighted_aurocs(rank_segments(y_true, scores), counts)
+    error = max(np.max(np.abs(batched[name] - expected[name])) for name in scores)
+
+    print(f'{args.models} models x {args.resamples:,} resamples of {args.rows:,} rows')
+    print(f'batched: {batched_seconds:8.2f} s')
+    print(f'loop:    {loop_seconds:8.2f} s (extrapolated from {args.loop_resamples} resamples)')
+    print(f'speedup: {loop_seconds / batched_seconds:8.1f}x, max AUROC difference {error:.1e}')
+
+if __name__ == "__main__":
+    main()
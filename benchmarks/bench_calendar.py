@@ -0,0 +1,66 @@
+"""
+Date derivation by calendar table gathers against per-row arithmetic
+
+For synthetic year/month/day arrays of growing size, times deriving
+validity, date, weekday and day of year with the dates.py arithmetic on
+every row and with calendar_index gathers, and checks both agree.
+
+    python benchmarks/bench_calendar.py --max-rows 100000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from harness import use_problem
+
+use_problem('problem1')
+
+import dates
+from calendar_index import calendar_index
+
+def by_arithmetic(year, month, day):
+    year, month, day = (np.asarray(column, dtype=np.int64) for column in (year, month, day))
+    valid = dates.is_valid_date(year, month, day)
+    days = dates.days_since_epoch(year, month, day)
+    return (valid,
+            np.where(valid, days, np.iinfo(np.int64).min).astype('datetime64[D]'),
+            np.where(valid, dates.weekday(days), -1).astype(np.int8),
+            np.where(valid, dates.day_of_year(year, month, day), 0).astype(np.int16))
+
+def by_table(year, month, day):
+    calendar = calendar_index(int(year.min()), int(year.max()))
+    slots = calendar.slots(year, month, day)
+    return calendar.valid[slots], calendar.date[slots], calendar.weekday[slots], calendar.day_of_year[slots]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Calendar table vs date arithmetic')
+    parser.add_argument('--min-rows', type=int, default=10**5)
+    parser.add_argument('--max-rows', type=int, default=10**7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f'{"rows":>12} {"arithmetic s":>13} {"table s":>9} {"speedup":>8} {"equal":>6}')
+    n_rows = args.min_rows
+    while n_rows <= args.max_rows:
+        # Compact dtypes as in the births column cache; days up to 31 give invalid dates
+        year = rng.integers(1969, 2009, n_rows).astype(np.int16)
+        month = rng.integers(1, 13, n_rows).astype(np.int8)
+        day = rng.integers(1, 32, n_rows).astype(np.int8)
+        arithmetic_seconds, expected = timed(by_arithmetic, year, month, day)
+        table_seconds, actual = timed(by_table, year, month, day)
+        # Compare dates as integers so NaT (invalid dates) counts as equal
+        equal = all(np.array_equal(a.view(np.int64) if a.dtype.kind == 'M' else a,
+                                   b.view(np.int64) if b.dtype.kind == 'M' else b)
+                    for a, b in zip(expected, actual))
+        print(f'{n_rows:>12,} {arithmetic_seconds:>13.3f} {table_seconds:>9.3f} '
+              f'{arithmetic_seconds / table_seconds:>7.1f}x {str(equal):>6}')
+        n_rows *= 10
+
+if __name__ == "__main__":
+    main()
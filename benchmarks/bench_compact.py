@@ -0,0 +1,97 @@
+"""
+Memory and test AUROC of the compact float32 pipeline against float64
+
+Writes synthetic ICU npz files, memory-maps them with ICUDataset, and
+prepares features once with prepare_data (float64, scaled copies for the
+SVM) and once with prepare_compact (float32, one matrix per split, with
+and without missing indicators). Reports the bytes of feature matrices
+each path keeps, the peak allocation while preparing them, and test AUROC
+of logistic regression, one forest and one SVM on each.
+
+With --missing-rate the data has NaNs. The float64 path has no
+imputation of its own, so it is given sklearn's SimpleImputer first.
+
+    python benchmarks/bench_compact.py --train 20000 --test 5000 --missing-rate 0.1
+"""
+import argparse
+import os
+import tempfile
+import tracemalloc
+import warnings
+
+import numpy as np
+from sklearn.impute import SimpleImputer
+
+from harness import use_problem
+from synthetic import write_icu_npz
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers
+from data_loader import ICUDataset
+
+RF_GRID = [{'max_depth': 5, 'n_estimators': 100}]
+SVM_GRID = [{'C': 1.0, 'kernel': 'rbf'}]
+
+def prepare(path, dataset, missing_indicators):
+    """Feature matrices kept by the pipeline: (X_train, X_test, X_train_scaled, X_test_scaled)"""
+    classifiers = ICUClassifiers(rf_grid=RF_GRID, svm_grid=SVM_GRID)
+    X_train, X_test = dataset.X_train, dataset.X_test
+    if path == 'float64':
+        if np.isnan(X_train).any():
+            imputer = SimpleImputer().fit(X_train)
+            X_train, X_test = imputer.transform(X_train), imputer.transform(X_test)
+        return classifiers, (X_train, X_test) + classifiers.prepare_data(X_train, None, X_test, None)
+    X_train, X_test = classifiers.prepare_compact(X_train, X_test, missing_indicators)
+    return classifiers, (X_train, X_test, X_train, X_test)
+
+def resident_bytes(arrays):
+    """Bytes of distinct in-memory arrays; memory maps are backed by the page cache"""
+    unique = {id(array): array for array in arrays if not isinstance(array, np.memmap)}
+    return sum(array.nbytes for array in unique.values())
+
+def test_aurocs(classifiers, arrays, y_train, y_test):
+    X_train, X_test, X_train_scaled, X_test_scaled = arrays
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+        classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+        classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+    return {name: results['test_auroc'] for name, results in classifiers.results.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact float32 pipeline vs float64')
+    parser.add_argument('--train', type=int, default=5000)
+    parser.add_argument('--test', type=int, default=2000)
+    parser.add_argument('--missing-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_compact_') as work_dir:
+        write_icu_npz(work_dir, n_train=args.train, n_test=args.test, missing_rate=args.missing_rate)
+        dataset = ICUDataset(os.path.join(work_dir, 'hw1_train.data.npz'),
+                             os.path.join(work_dir, 'hw1_test.data.npz'))
+        y_train, y_test = np.asarray(dataset.y_train), np.asarray(dataset.y_test)
+
+        runs = [('float64', False), ('compact', False)]
+        if args.missing_rate > 0:
+            runs.append(('compact', True))
+        reports = []
+        for path, missing_indicators in runs:
+            tracemalloc.start()
+            classifiers, arrays = prepare(path, dataset, missing_indicators)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            label = path + (' + indicators' if missing_indicators else '')
+            reports.append((label, resident_bytes(arrays), peak,
+                            test_aurocs(classifiers, arrays, y_train, y_test)))
+
+    print(f'{args.train:,} + {args.test:,} rows, missing rate {args.missing_rate}')
+    print(f'{"path":<22} {"features MB":>12} {"prepare peak MB":>16}  test AUROC')
+    baseline = reports[0][3]
+    for label, kept, peak, aurocs in reports:
+        scores = ', '.join(f'{name.split("_")[0]} {auroc:.4f} ({auroc - baseline[name]:+.4f})'
+                           for name, auroc in aurocs.items())
+        print(f'{label:<22} {kept / 1e6:>12.1f} {peak / 1e6:>16.1f}  {scores}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+ICUClassifiers.cross_validate against per-configuration cross_val_score
+
+On synthetic ICU data, times k-fold CV over the default grids with the
+engine (one scaler per fold, memory-mapped fold arrays, largest jobs
+first, --jobs processes) and with sklearn's cross_val_score run serially
+per configuration (SVMs in a StandardScaler pipeline, so the scaler is
+refitted for every configuration), and checks the fold AUROCs agree.
+
+    python benchmarks/bench_cross_validation.py --train 2000 --folds 5 --jobs 4
+"""
+import argparse
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+from harness import use_problem
+from synthetic import synthetic_icu_data
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers, LR_PARAMS, _rf_name, _svm_name
+
+def test_auroc(estimator, X, y):
+    """AUROC on predict_proba when the model has it, as evaluate_model scores"""
+    if hasattr(estimator, 'predict_proba'):
+        return roc_auc_score(y, estimator.predict_proba(X)[:, 1])
+    return roc_auc_score(y, estimator.decision_function(X))
+
+def serial_cross_validation(classifiers, X, y, n_folds):
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+    estimators = {'logistic_regression': LogisticRegression(**LR_PARAMS)}
+    for params in classifiers.rf_grid:
+        estimators[_rf_name(params)] = RandomForestClassifier(**params, random_state=42)
+    for params in classifiers.svm_grid:
+        estimators[_svm_name(params)] = make_pipeline(StandardScaler(), SVC(**classifiers._svm_params(params)))
+    return {name: cross_val_score(estimator, X, y, cv=folds, scoring=test_auroc)
+            for name, estimator in estimators.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-validation engine vs cross_val_score')
+    parser.add_argument('--train', type=int, default=1000)
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    X_train, y_train, _, _ = synthetic_icu_data(args.train, 10)
+    classifiers = ICUClassifiers(n_jobs=args.jobs)
+
+    start = time.perf_counter()
+    expected = serial_cross_validation(classifiers, X_train, y_train, args.folds)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cv_results = classifiers.cross_validate(X_train, y_train, args.folds)
+    engine_seconds = time.perf_counter() - start
+
+    error = max(np.max(np.abs(np.array(cv_results[name]['cv_auroc_folds']) - expected[name]))
+                for name in expected)
+    print(f'{len(expected)} configurations x {args.folds} folds on {args.train:,} rows')
+    print(f'cross_val_score, serial: {serial_seconds:8.2f} s')
+    print(f'engine, {args.jobs} job(s):       {engine_seconds:8.2f} s')
+    print(f'max fold AUROC difference {error:.1e}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Scaling of decade_analysis.decade_gender_summary with the number of rows
+
+Times the summary on synthetic births tables from 10^5 up to --max-rows
+(10^8 by default, which needs a few GB of RAM) and prints the cost per
+row. Linear scaling shows up as a roughly constant ns/row column.
+
+    python benchmarks/bench_decade_scaling.py --max-rows 10000000
+"""
+import argparse
+import time
+
+from harness import use_problem
+from synthetic import synthetic_births_rows
+
+use_problem('problem1')
+
+from decade_analysis import decade_gender_summary
+
+def best_time(func, data, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description='Row scaling of the decade summary')
+    parser.add_argument('--min-rows', type=int, default=10**5)
+    parser.add_argument('--max-rows', type=int, default=10**8)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"rows":>12} {"seconds":>10} {"ns/row":>8}')
+    n_rows = args.min_rows
+    while n_rows <= args.max_rows:
+        data = synthetic_births_rows(n_rows)
+        seconds = best_time(decade_gender_summary, data, args.repeats)
+        print(f'{n_rows:>12,} {seconds:>10.4f} {seconds / n_rows * 1e9:>8.2f}')
+        del data
+        n_rows *= 10
+
+if __name__ == "__main__":
+    main()
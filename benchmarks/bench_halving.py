@@ -0,0 +1,50 @@
+"""
+Successive halving against the exhaustive random forest and SVM grids
+
+Runs train_random_forest and train_svm once with search='grid' and once
+with search='halving' on the same synthetic data, and prints CPU time,
+configurations fitted to completion and the best model chosen by each.
+
+    python benchmarks/bench_halving.py --train 2000 --test 1000
+"""
+import argparse
+import time
+
+from harness import use_problem
+from synthetic import synthetic_icu_data
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers
+
+def best_name(results, prefix):
+    names = [name for name in results if name.startswith(prefix)]
+    return max(names, key=lambda name: results[name]['test_auroc'])
+
+def run(search, X_train, y_train, X_test, y_test):
+    classifiers = ICUClassifiers(search=search)
+    X_train_scaled, X_test_scaled = classifiers.prepare_data(X_train, y_train, X_test, y_test)
+    start = time.process_time()
+    rf_results = classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+    svm_results = classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+    return time.process_time() - start, rf_results, svm_results
+
+def main():
+    parser = argparse.ArgumentParser(description='Grid search vs successive halving')
+    parser.add_argument('--train', type=int, default=2000)
+    parser.add_argument('--test', type=int, default=1000)
+    parser.add_argument('--features', type=int, default=112)
+    args = parser.parse_args()
+
+    data = synthetic_icu_data(args.train, args.test, n_features=args.features)
+    runs = {search: run(search, *data) for search in ('grid', 'halving')}
+
+    print(f'{"search":<8} {"cpu s":>8} {"rf fitted":>10} {"svm fitted":>11}  best forest / best SVM')
+    for search, (seconds, rf_results, svm_results) in runs.items():
+        print(f'{search:<8} {seconds:>8.2f} {len(rf_results):>10} {len(svm_results):>11}  '
+              f'{best_name(rf_results, "random_forest")} / {best_name(svm_results, "svm")}')
+    grid_seconds, halving_seconds = runs['grid'][0], runs['halving'][0]
+    print(f'\nhalving used {halving_seconds / grid_seconds:.0%} of the grid CPU time')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Memory and accuracy of the out-of-core SGD logistic model against batch LR
+
+Writes a synthetic training set of --rows stays as .npy files, memory-maps
+them and trains ICUClassifiers.train_incremental_logistic over chunks.
+Peak heap allocation is measured with tracemalloc, which counts NumPy
+buffers but not the file-backed pages of the memory map. Batch logistic
+regression is trained on the same data for comparison unless --no-batch.
+
+    python benchmarks/bench_incremental.py --rows 1000000 --chunk-rows 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+
+from harness import use_problem
+from synthetic import synthetic_icu_data
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers
+
+def measured(func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, seconds, peak / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='Out-of-core SGD logistic regression')
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--test', type=int, default=20_000)
+    parser.add_argument('--chunk-rows', type=int, default=20_000)
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--no-batch', action='store_true', help='Skip the in-memory LR fit')
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore', category=UserWarning)
+    X_train, y_train, X_test, y_test = synthetic_icu_data(args.rows, args.test)
+    with tempfile.TemporaryDirectory(prefix='bench_incremental_') as work_dir:
+        np.save(os.path.join(work_dir, 'X_train.npy'), X_train)
+        np.save(os.path.join(work_dir, 'y_train.npy'), y_train)
+        del X_train, y_train
+        X_train = np.load(os.path.join(work_dir, 'X_train.npy'), mmap_mode='r')
+        y_train = np.load(os.path.join(work_dir, 'y_train.npy'), mmap_mode='r')
+        print(f'training data: {X_train.nbytes / 1e6:,.0f} MB on disk')
+
+        classifiers = ICUClassifiers()
+        results, seconds, peak = measured(classifiers.train_incremental_logistic,
+                                          X_train, y_train, X_test, y_test,
+                                          chunk_rows=args.chunk_rows, n_epochs=args.epochs)
+        print(f'{"incremental (SGD)":<18} {seconds:8.2f}s  peak heap {peak:8.1f} MB  '
+              f'test AUROC {results["test_auroc"]:.4f}  accuracy {results["test_accuracy"]:.4f}')
+
+        if not args.no_batch:
+            # np.array copies the map into memory, as a batch fit needs
+            results, seconds, peak = measured(
+                lambda: classifiers.train_logistic_regression(np.array(X_train), y_train,
+                                                              X_test, y_test))
+            print(f'{"batch (lbfgs)":<18} {seconds:8.2f}s  peak heap {peak:8.1f} MB  '
+                  f'test AUROC {results["test_auroc"]:.4f}  accuracy {results["test_accuracy"]:.4f}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Single-row latency of the NumPy inference kernels against predict_proba
+
+Trains logistic regression and the random forest grid on synthetic ICU
+data, exports the kernels and times scoring one patient at a time with
+each. Also checks that kernel and sklearn probabilities are identical on
+the whole test set.
+
+    python benchmarks/bench_kernels.py --calls 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from harness import use_problem
+from synthetic import synthetic_icu_data
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers
+
+def per_call_us(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='NumPy kernels vs sklearn predict_proba')
+    parser.add_argument('--train', type=int, default=2000)
+    parser.add_argument('--test', type=int, default=1000)
+    parser.add_argument('--calls', type=int, default=200, help='Single-row calls per model')
+    args = parser.parse_args()
+
+    X_train, y_train, X_test, y_test = synthetic_icu_data(args.train, args.test)
+    classifiers = ICUClassifiers()
+    classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+    classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+    kernels = classifiers.export_kernels()
+
+    rows = X_test[:args.calls, np.newaxis, :]
+    print(f'{"model":<30} {"sklearn us":>11} {"kernel us":>10} {"speedup":>8} {"identical":>10}')
+    for name, kernel in kernels.items():
+        model = classifiers.models[name]
+        identical = np.array_equal(kernel.predict_proba(X_test), model.predict_proba(X_test)[:, 1])
+        sklearn_us = per_call_us(model.predict_proba, rows)
+        kernel_us = per_call_us(kernel.predict_proba, rows)
+        print(f'{name:<30} {sklearn_us:>11.1f} {kernel_us:>10.1f} '
+              f'{sklearn_us / kernel_us:>7.1f}x {str(identical):>10}')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark suite for the problem1 births pipeline on synthetic data
+
+Stages: cold CSV load (parse + cache write), cached load, feature frame,
+each analysis (headless, with the time spent saving figures reported as
+render_seconds), each analysis again with its figure cache warm, and the
+chunked aggregation path.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from harness import StageRecorder, use_problem
+from synthetic import write_births_csv
+
+use_problem('problem1')
+
+import config
+import plotting
+from data_loader import load_and_explore_data, build_feature_frame, aggregate_births_csv
+from decade_analysis import births_by_decade_analysis
+from yearly_trends import yearly_birth_trends
+from weekday_patterns import weekday_birth_patterns
+from seasonal_analysis import seasonal_birth_analysis
+
+ANALYSES = [
+    ('decade', births_by_decade_analysis),
+    ('yearly', yearly_birth_trends),
+    ('weekday', weekday_birth_patterns),
+    ('seasonal', seasonal_birth_analysis)
+]
+
+def time_rendering():
+    """Wrap plotting.save_figure so the time spent saving figures can be read back"""
+    spent = {'seconds': 0.0}
+    save_figure = plotting.save_figure
+
+    def timed_save_figure(fig, basename):
+        start = time.perf_counter()
+        save_figure(fig, basename)
+        spent['seconds'] += time.perf_counter() - start
+
+    plotting.save_figure = timed_save_figure
+    return spent
+
+def run_suite(recorder, repeat=1, chunksize=500_000):
+    config.HEADLESS = True
+    render = time_rendering()
+
+    with tempfile.TemporaryDirectory(prefix='bench_problem1_') as work_dir:
+        os.chdir(work_dir)
+        with recorder.stage('generate_csv') as record:
+            rows = write_births_csv('CDCbirths.csv', repeat=repeat)
+            record['rows'] = rows
+
+        with recorder.stage('load_csv_cold', rows):
+            load_and_explore_data('CDCbirths.csv')
+        with recorder.stage('load_cached', rows):
+            data = load_and_explore_data('CDCbirths.csv')
+        with recorder.stage('build_feature_frame', rows):
+            frame = build_feature_frame(data)
+
+        for name, analysis in ANALYSES:
+            render['seconds'] = 0.0
+            with recorder.stage(f'analysis:{name}', rows) as record:
+                analysis(frame)
+            record['render_seconds'] = render['seconds']
+
+        # Same data and style: the saved figures are reused, nothing is rendered
+        for name, analysis in ANALYSES:
+            render['seconds'] = 0.0
+            with recorder.stage(f'analysis_cached:{name}', rows) as record:
+                analysis(frame)
+            record['render_seconds'] = render['seconds']
+
+        with recorder.stage('aggregate_chunked', rows):
+            aggregate_births_csv('CDCbirths.csv', chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description='problem1 benchmark suite')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Multiply the synthetic table (about 15k rows per repeat)')
+    parser.add_argument('--chunksize', type=int, default=500_000)
+    parser.add_argument('--json', help='Write the stage results to this file')
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    recorder = StageRecorder('problem1', {'repeat': args.repeat, 'chunksize': args.chunksize})
+    run_suite(recorder, args.repeat, args.chunksize)
+    if json_path:
+        recorder.write_json(json_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark suite for the problem2 ICU classifiers on synthetic data
+
+Stages: npz load (cold, which writes the .npy sidecars, and warm),
+dataset exploration with streaming statistics, scaling and every
+ICUClassifiers.train_* method, followed by model selection.
+"""
+import argparse
+import os
+import tempfile
+
+from harness import StageRecorder, use_problem
+from synthetic import write_icu_npz
+
+use_problem('problem2')
+
+from data_loader import ICUDataset, load_icu_data, explore_dataset
+from classifiers import ICUClassifiers
+
+def run_suite(recorder, n_train=2000, n_test=1000, n_features=112):
+    with tempfile.TemporaryDirectory(prefix='bench_problem2_') as work_dir:
+        os.chdir(work_dir)
+        with recorder.stage('generate_npz', n_train + n_test):
+            write_icu_npz(work_dir, n_train=n_train, n_test=n_test, n_features=n_features)
+
+        with recorder.stage('load_icu_data', n_train + n_test):
+            X_train, y_train, X_test, y_test = load_icu_data()
+        with recorder.stage('load_icu_data_warm', n_train + n_test):
+            X_train, y_train, X_test, y_test = load_icu_data()
+        with recorder.stage('explore_dataset', n_train + n_test):
+            explore_dataset(X_train, y_train, X_test, y_test, ICUDataset().feature_stats())
+        with recorder.stage('explore_dataset_warm', n_train + n_test):
+            explore_dataset(X_train, y_train, X_test, y_test, ICUDataset().feature_stats())
+
+        classifiers = ICUClassifiers()
+        with recorder.stage('prepare_data', n_train + n_test):
+            X_train_scaled, X_test_scaled = classifiers.prepare_data(X_train, y_train, X_test, y_test)
+
+        with recorder.stage('train_logistic_regression', n_train):
+            classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+        with recorder.stage('train_random_forest', n_train):
+            classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+        with recorder.stage('train_svm', n_train):
+            classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+        with recorder.stage('get_best_models'):
+            classifiers.get_best_models()
+
+def main():
+    parser = argparse.ArgumentParser(description='problem2 benchmark suite')
+    parser.add_argument('--train', type=int, default=2000, help='Training rows')
+    parser.add_argument('--test', type=int, default=1000, help='Test rows')
+    parser.add_argument('--features', type=int, default=112)
+    parser.add_argument('--json', help='Write the stage results to this file')
+    args = parser.parse_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    params = {'train': args.train, 'test': args.test, 'features': args.features}
+    recorder = StageRecorder('problem2', params)
+    run_suite(recorder, args.train, args.test, args.features)
+    if json_path:
+        recorder.write_json(json_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Check that headless report generation does not leak memory
+
+Runs the yearly, weekday and seasonal reports repeatedly in one process
+with config.HEADLESS enabled and prints the resident set size at regular
+intervals. RSS should stay flat once the first few reports have warmed up.
+
+    python benchmarks/bench_render_memory.py --iterations 1000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from harness import current_rss_mb, use_problem
+from synthetic import synthetic_births_table
+
+use_problem('problem1')
+
+import config
+from data_loader import build_feature_frame
+from yearly_trends import yearly_birth_trends
+from weekday_patterns import weekday_birth_patterns
+from seasonal_analysis import seasonal_birth_analysis
+
+def main():
+    parser = argparse.ArgumentParser(description='RSS across repeated headless reports')
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--sample-every', type=int, default=100)
+    args = parser.parse_args()
+
+    config.HEADLESS = True
+    # Every iteration must render; cached figures would skip the code under test
+    config.FIGURE_CACHE = False
+    data = build_feature_frame(synthetic_births_table())
+    samples = []
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        os.chdir(output_dir)
+        start = time.perf_counter()
+        for i in range(1, args.iterations + 1):
+            yearly_birth_trends(data)
+            weekday_birth_patterns(data)
+            seasonal_birth_analysis(data)
+            if i == 1 or i % args.sample_every == 0:
+                samples.append((i, current_rss_mb()))
+                print(f'iteration {i:5d}  rss {samples[-1][1]:8.1f} MB')
+        elapsed = time.perf_counter() - start
+
+    # Growth is measured after the first sample so import/font caches don't count
+    growth = samples[-1][1] - samples[0][1]
+    print(f'{args.iterations} reports in {elapsed:.1f}s '
+          f'({elapsed / args.iterations * 1000:.1f} ms each), RSS growth {growth:+.1f} MB')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Startup cost of problem1/run_analysis.py per command line
+
+Runs the CLI with `python -X importtime` in a temporary directory holding a
+small synthetic CDCbirths.csv and reports, per case, the median process
+wall time, the total import time and whether matplotlib was imported.
+Cases with an import budget fail the run (exit status 1) when over it.
+
+    python benchmarks/bench_startup.py --repeats 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from harness import REPO_DIR
+from synthetic import write_births_csv
+
+RUN_ANALYSIS = os.path.join(REPO_DIR, 'problem1', 'run_analysis.py')
+
+# (label, arguments, import budget in ms or None, may import matplotlib)
+CASES = [
+    ('--help', ['--help'], 150, False),
+    ('--decade', ['--decade', '--headless'], 700, False),
+    ('--all', ['--all', '--headless'], None, True)
+]
+
+def import_profile(stderr):
+    """Total top-level import time in ms and the set of imported module names"""
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules.add(name.strip())
+        # Top-level imports are indented by exactly one space after the bar
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+def run_case(arguments, work_dir):
+    command = [sys.executable, '-X', 'importtime', RUN_ANALYSIS] + arguments
+    start = time.perf_counter()
+    process = subprocess.run(command, cwd=work_dir, capture_output=True, text=True, check=True)
+    return time.perf_counter() - start, *import_profile(process.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description='run_analysis.py startup time')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = []
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as work_dir:
+        write_births_csv(os.path.join(work_dir, 'CDCbirths.csv'), last_year=1970)
+        print(f'{"case":<10} {"wall ms":>8} {"imports ms":>11} {"budget":>7} {"matplotlib":>11}')
+        for label, arguments, budget, matplotlib_allowed in CASES:
+            runs = [run_case(arguments, work_dir) for _ in range(args.repeats)]
+            wall_ms = statistics.median(run[0] for run in runs) * 1000
+            import_ms = statistics.median(run[1] for run in runs)
+            uses_matplotlib = any(module.startswith('matplotlib') for module in runs[0][2])
+            print(f'{label:<10} {wall_ms:>8.0f} {import_ms:>11.0f} '
+                  f'{budget if budget else "-":>7} {str(uses_matplotlib):>11}')
+            if (budget and import_ms > budget) or (uses_matplotlib and not matplotlib_allowed):
+                over_budget.append(label)
+
+    if over_budget:
+        print(f'over budget: {", ".join(over_budget)}')
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
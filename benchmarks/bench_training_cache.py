@@ -0,0 +1,56 @@
+"""
+Cold, warm and partially changed sweeps through the training cache
+
+Trains the logistic regression, random forest and SVM grids on synthetic
+data three times against a fresh cache directory: cold (everything
+fitted), warm (everything loaded) and with one forest configuration added
+to the grid (only that one fitted). Prints wall time, cache hits and
+misses, and whether the warm results equal the cold ones.
+
+    python benchmarks/bench_training_cache.py --train 2000 --test 1000
+"""
+import argparse
+import tempfile
+import time
+
+from harness import use_problem
+from synthetic import synthetic_icu_data
+
+use_problem('problem2')
+
+from classifiers import ICUClassifiers, RF_PARAM_GRID
+from training_cache import TrainingCache
+
+def run(cache, rf_grid, X_train, y_train, X_test, y_test):
+    cache.hits = cache.misses = 0
+    classifiers = ICUClassifiers(rf_grid=rf_grid, cache=cache)
+    start = time.perf_counter()
+    X_train_scaled, X_test_scaled = classifiers.prepare_data(X_train, y_train, X_test, y_test)
+    classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+    classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+    classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+    return time.perf_counter() - start, classifiers.get_all_results()
+
+def main():
+    parser = argparse.ArgumentParser(description='Training cache cold vs warm')
+    parser.add_argument('--train', type=int, default=2000)
+    parser.add_argument('--test', type=int, default=1000)
+    args = parser.parse_args()
+
+    data = synthetic_icu_data(args.train, args.test)
+    extended_grid = RF_PARAM_GRID + [{'n_estimators': 150, 'max_depth': 12}]
+    with tempfile.TemporaryDirectory(prefix='bench_training_cache_') as directory:
+        cache = TrainingCache(directory)
+        print(f'{"run":<10} {"wall s":>8} {"hits":>5} {"misses":>7}')
+        cold_results = None
+        for label, grid in (('cold', RF_PARAM_GRID), ('warm', RF_PARAM_GRID),
+                            ('one new', extended_grid)):
+            seconds, results = run(cache, grid, *data)
+            print(f'{label:<10} {seconds:>8.2f} {cache.hits:>5} {cache.misses:>7}')
+            if cold_results is None:
+                cold_results = results
+            elif grid is RF_PARAM_GRID:
+                print(f'warm results equal cold: {results == cold_results}')
+
+if __name__ == "__main__":
+    main()
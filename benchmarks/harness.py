@@ -0,0 +1,80 @@
+"""
+Stage timing, memory readings and JSON results shared by the benchmark suites
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+# Shared modules at the repository root (instrumentation, json_files)
+sys.path.insert(0, REPO_DIR)
+
+from instrumentation import peak_rss_mb
+
+def use_problem(name):
+    """Put problem1/ or problem2/ on sys.path (their modules use flat imports)"""
+    sys.path.insert(0, os.path.join(REPO_DIR, name))
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux /proc, else peak RSS)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except OSError:
+        return peak_rss_mb()
+
+def git_commit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+class StageRecorder:
+    """Collects wall time, CPU time, memory and throughput for named stages"""
+
+    def __init__(self, suite, params=None):
+        self.suite = suite
+        self.params = params or {}
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the body of a with block; extra fields can be set on the yielded dict"""
+        record = {'stage': name, 'rows': rows}
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - start
+            record['wall_seconds'] = wall
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['rss_mb'] = current_rss_mb()
+            record['peak_rss_mb'] = peak_rss_mb()
+            if record['rows'] and wall > 0:
+                record['rows_per_second'] = record['rows'] / wall
+            self.stages.append(record)
+            print(f'{self.suite:>10} {name:<34} {wall:9.3f}s  peak {record["peak_rss_mb"]:8.1f} MB',
+                  flush=True)
+
+    def to_dict(self):
+        return {
+            'suite': self.suite,
+            'params': self.params,
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'stages': self.stages
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,82 @@
+"""
+Load test for problem2/scoring_service.py
+
+Opens --concurrency keep-alive connections to a running server and sends
+--requests single-patient POST /score requests in total. Prints client-side
+p50/p99 latency and throughput, then the server's own /stats (which include
+the mean micro-batch size).
+
+    python problem2/scoring_service.py --models icu_models.joblib &
+    python benchmarks/load_test_scoring.py --requests 5000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\n'
+                 f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'
+                 .encode('latin-1') + body)
+    await writer.drain()
+    status = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    response = json.loads(await reader.readexactly(length))
+    if not status.split()[1].startswith(b'2'):
+        raise RuntimeError(f'{path}: {response}')
+    return response
+
+async def client(host, port, rows, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for row in rows:
+            start = time.perf_counter()
+            await request(reader, writer, 'POST', '/score', {'features': row})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+async def run(args):
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    health = await request(reader, writer, 'GET', '/health')
+    writer.close()
+
+    rng = np.random.default_rng(0)
+    rows = rng.standard_normal((args.requests, health['n_features'])).tolist()
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.host, args.port, rows[i::args.concurrency], latencies)
+                           for i in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    stats = await request(reader, writer, 'GET', '/stats')
+    writer.close()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f'model: {health["model"]}, {args.requests} requests, concurrency {args.concurrency}')
+    print(f'client p50 {p50:.2f} ms, p99 {p99:.2f} ms, {args.requests / elapsed:,.0f} requests/s')
+    print(f'server p50 {stats["p50_ms"]:.2f} ms, p99 {stats["p99_ms"]:.2f} ms, '
+          f'mean batch size {stats["mean_batch_size"]:.1f}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the ICU scoring service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
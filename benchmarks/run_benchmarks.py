@@ -0,0 +1,104 @@
+"""
+Run the benchmark suites and compare them against a stored baseline
+
+Each suite runs in its own process: problem1 and problem2 both have flat
+modules called data_loader/main, and a fresh process also gives every
+suite its own peak RSS reading.
+
+    python benchmarks/run_benchmarks.py --save-baseline before
+    ... change code ...
+    python benchmarks/run_benchmarks.py --compare before
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from harness import BENCHMARK_DIR, git_commit
+
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, 'baselines')
+
+def run_suite(script, extra_args):
+    """Run one suite script in a subprocess and return its JSON results"""
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'result.json')
+        command = [sys.executable, os.path.join(BENCHMARK_DIR, script), '--json', json_path]
+        subprocess.run(command + extra_args, check=True)
+        with open(json_path) as f:
+            return json.load(f)
+
+def baseline_path(name):
+    if os.path.exists(name):
+        return name
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+def compare(results, baseline, threshold):
+    """Print per-stage wall time changes; return the stages slower than threshold"""
+    regressions = []
+    print(f'\n{"suite":>10} {"stage":<34} {"baseline":>10} {"current":>10} {"change":>8}')
+    for suite, current in results['suites'].items():
+        previous = {s['stage']: s for s in baseline['suites'].get(suite, {}).get('stages', [])}
+        for stage in current['stages']:
+            before = previous.get(stage['stage'])
+            if before is None or before['wall_seconds'] <= 0:
+                continue
+            change = stage['wall_seconds'] / before['wall_seconds'] - 1
+            flag = '  <-- slower' if change > threshold else ''
+            print(f'{suite:>10} {stage["stage"]:<34} {before["wall_seconds"]:>9.3f}s '
+                  f'{stage["wall_seconds"]:>9.3f}s {change:>+7.1%}{flag}')
+            if flag:
+                regressions.append((suite, stage['stage'], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Run problem1/problem2 benchmarks')
+    parser.add_argument('--suites', nargs='+', default=['problem1', 'problem2'],
+                        choices=['problem1', 'problem2'])
+    parser.add_argument('--births-repeat', type=int, default=1,
+                        help='Scale of the synthetic births table')
+    parser.add_argument('--icu-train', type=int, default=2000)
+    parser.add_argument('--icu-test', type=int, default=1000)
+    parser.add_argument('--icu-features', type=int, default=112)
+    parser.add_argument('--output', help='Write combined results to this JSON file')
+    parser.add_argument('--save-baseline', metavar='NAME',
+                        help='Store the results as benchmarks/baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME_OR_PATH',
+                        help='Compare against a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    suite_args = {
+        'problem1': ('bench_problem1.py', ['--repeat', str(args.births_repeat)]),
+        'problem2': ('bench_problem2.py', ['--train', str(args.icu_train),
+                                           '--test', str(args.icu_test),
+                                           '--features', str(args.icu_features)])
+    }
+
+    results = {'commit': git_commit(), 'suites': {}}
+    for suite in args.suites:
+        script, extra_args = suite_args[suite]
+        results['suites'][suite] = run_suite(script, extra_args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'\n{len(regressions)} stage(s) slower than the baseline by more than '
+                  f'{args.threshold:.0%}')
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic stand-ins for CDCbirths.csv and the ICU npz files
+
+The real inputs are not in the repository, so the benchmarks generate
+data with the same columns, dtypes and rough statistics:
+
+- births: one row per date and gender with a yearly trend, a weekend dip
+  and a late-summer peak. After day_until only monthly rows with a missing
+  day exist, and a few invalid days (31st of short months, day 99) are
+  mixed in, as in the CDC extract. repeat multiplies the row count as if
+  the table were split by county.
+- ICU: a float feature matrix and roughly 14% positive labels drawn from
+  a logistic model of a few informative features.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+def synthetic_births_table(first_year=1969, last_year=2008, day_until=1988, repeat=1,
+                           invalid_rate=0.002, seed=0):
+    """Births table with the columns of CDCbirths.csv"""
+    rng = np.random.default_rng(seed)
+
+    # Daily rows for the early years
+    days = pd.date_range(f'{first_year}-01-01', f'{min(day_until, last_year)}-12-31')
+    weekend = days.dayofweek >= 5
+    season = 1 + 0.05 * np.sin(2 * np.pi * (days.dayofyear - 170) / 365.25)
+    trend = 1 + 0.01 * (days.year - first_year)
+    daily_mean = 5200 * season * trend * np.where(weekend, 0.82, 1.0)
+    daily = pd.DataFrame({
+        'year': days.year,
+        'month': days.month,
+        'day': days.day.astype(float),
+        'expected': daily_mean
+    })
+
+    # A few invalid or unknown days, as in the real extract
+    n_invalid = int(len(daily) * invalid_rate)
+    invalid = daily.sample(n_invalid, random_state=seed).assign(
+        day=rng.choice([31.0, 99.0], n_invalid), expected=lambda d: d['expected'] * 0.01)
+
+    # Monthly rows without a day for the later years
+    months = pd.period_range(f'{day_until + 1}-01', f'{last_year}-12', freq='M')
+    monthly = pd.DataFrame({
+        'year': months.year,
+        'month': months.month,
+        'day': np.nan,
+        'expected': 5200 * 30.4 * (1 + 0.01 * (months.year - first_year))
+    })
+
+    base = pd.concat([daily, invalid, monthly], ignore_index=True)
+    frames = []
+    for gender, share in [('F', 0.488), ('M', 0.512)]:
+        frames.append(base.assign(gender=gender, expected=base['expected'] * share / repeat))
+    table = pd.concat(frames * repeat, ignore_index=True)
+
+    table['births'] = rng.poisson(table['expected']).astype(np.int64)
+    table = table.drop(columns='expected').sort_values(['year', 'month', 'day'], kind='stable')
+    return table.reset_index(drop=True)[['year', 'month', 'day', 'gender', 'births']]
+
+def synthetic_births_rows(n_rows, seed=0):
+    """Random births rows with the compact dtypes of the births cache"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'year': rng.integers(1960, 2010, n_rows).astype(np.int16),
+        'gender': pd.Categorical.from_codes(rng.integers(0, 2, n_rows).astype(np.int8), ['F', 'M']),
+        'births': rng.integers(1, 6000, n_rows)
+    })
+
+def write_births_csv(path, **kwargs):
+    """Write a synthetic births table to CSV and return its row count"""
+    table = synthetic_births_table(**kwargs)
+    table.to_csv(path, index=False)
+    return len(table)
+
+def synthetic_icu_data(n_train=2000, n_test=1000, n_features=112, positive_rate=0.14,
+                       seed=0, missing_rate=0.0):
+    """Feature matrices and 0/1 labels shaped like the Physionet 2012 extract
+
+    missing_rate > 0 blanks that fraction of values (NaN) in a random half
+    of the features, more often for positive patients, as sparse lab
+    measurements are.
+    """
+    rng = np.random.default_rng(seed)
+    n = n_train + n_test
+
+    # Correlated features on different scales
+    latent = rng.normal(size=(n, 8))
+    mixing = rng.normal(size=(8, n_features))
+    scales = rng.uniform(0.5, 50, n_features)
+    X = (latent @ mixing + rng.normal(size=(n, n_features))) * scales + rng.uniform(0, 100, n_features)
+
+    # Labels depend on a handful of latent factors plus logistic noise
+    risk = latent[:, :3] @ np.array([1.2, -0.8, 0.6]) + rng.logistic(size=n)
+    y = (risk > np.quantile(risk, 1 - positive_rate)).astype(np.int64)
+
+    if missing_rate > 0:
+        sparse = rng.permutation(n_features)[:n_features // 2]
+        rate = np.where(y[:, None] == 1, 1.5, 0.9) * missing_rate * 2
+        X[:, sparse] = np.where(rng.random((n, len(sparse))) < rate, np.nan, X[:, sparse])
+
+    return X[:n_train], y[:n_train], X[n_train:], y[n_train:]
+
+def write_icu_npz(directory, **kwargs):
+    """Write hw1_train.data.npz and hw1_test.data.npz like the course files"""
+    X_train, y_train, X_test, y_test = synthetic_icu_data(**kwargs)
+    np.savez(os.path.join(directory, 'hw1_train.data.npz'), X_train=X_train, y_train=y_train)
+    np.savez(os.path.join(directory, 'hw1_test.data.npz'), X_test=X_test, y_test=y_test)
+    return X_train.shape, X_test.shape
@@ -0,0 +1,129 @@
+"""
+Per-stage timing and memory instrumentation shared by both problems
+
+The entry scripts wrap each loader, analysis and training step in
+PROFILER.stage(name, rows=...). While the profiler is disabled (the
+default) a stage is a bare nullcontext, so the calls cost next to
+nothing. enable() turns on recording of wall time, CPU time and the
+process's peak RSS per stage; enable(trace_memory=True) adds the peak of
+Python/NumPy allocations inside each stage via tracemalloc, which slows
+allocation-heavy code (forest fitting) several times over. write() saves
+the records as JSON lines, or as a Chrome trace (chrome://tracing,
+Perfetto) when the file name ends in .json.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler:
+    """Records nested, named stages of a pipeline run"""
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._stack = []
+
+    def enable(self, trace_memory=False):
+        self.enabled = True
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name, rows=None):
+        """Context manager measuring its body; yields the record dict (or {} when off)"""
+        if not self.enabled:
+            return nullcontext({})
+        return self._measure(name, rows)
+
+    @contextmanager
+    def _measure(self, name, rows):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # The parent keeps its own high-water mark across the reset below
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+        frame = {'peak': 0, 'start_bytes': current if tracing else 0}
+        self._stack.append(frame)
+
+        record = {'stage': name, 'rows': rows, 'depth': len(self._stack) - 1,
+                  'pid': os.getpid(), 'tid': threading.get_ident()}
+        record['start'] = time.time()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - start
+            record['wall_seconds'] = wall
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            if record['rows'] and wall > 0:
+                record['rows_per_second'] = record['rows'] / wall
+            record['peak_rss_mb'] = peak_rss_mb()
+
+            self._stack.pop()
+            if tracing:
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                record['peak_alloc_mb'] = (peak - frame['start_bytes']) / 1e6
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            self.records.append(record)
+
+    def drain(self):
+        """Return and clear the records, e.g. to ship them out of a worker process"""
+        records, self.records = self.records, []
+        return records
+
+    def write(self, path):
+        """Write the records as a Chrome trace (*.json) or as JSON lines"""
+        if path.endswith('.json'):
+            events = [{
+                'name': record['stage'],
+                'ph': 'X',
+                'ts': record['start'] * 1e6,
+                'dur': record['wall_seconds'] * 1e6,
+                'pid': record['pid'],
+                'tid': record['tid'],
+                'args': {key: value for key, value in record.items()
+                         if key not in ('stage', 'start', 'pid', 'tid')}
+            } for record in self.records]
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        else:
+            with open(path, 'w') as f:
+                for record in self.records:
+                    f.write(json.dumps(record) + '\n')
+        return path
+
+    def summary(self):
+        """One line per stage, for printing at the end of a run"""
+        lines = []
+        for record in sorted(self.records, key=lambda record: record['start']):
+            line = (f"{'  ' * record['depth']}{record['stage']:<{40 - 2 * record['depth']}} "
+                    f"{record['wall_seconds']:9.3f}s wall {record['cpu_seconds']:9.3f}s cpu")
+            if 'peak_alloc_mb' in record:
+                line += f" {record['peak_alloc_mb']:9.1f} MB allocated"
+            elif record['peak_rss_mb'] is not None:
+                line += f" {record['peak_rss_mb']:9.1f} MB peak RSS"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def peak_rss_mb():
+    """High-water RSS of this process in MB, or None where resource is unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+# Process-wide profiler used by the entry scripts
+PROFILER = Profiler()
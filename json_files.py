@@ -0,0 +1,24 @@
+"""
+JSON manifests shared by the caches of both problems
+
+Writes go to a temporary file that is then renamed over the target, so a
+reader never sees a half-written manifest.
+"""
+import json
+import os
+
+
+def read_json(path):
+    """Parsed contents of a JSON file, or None if it is missing or unreadable"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """Write data as JSON, atomically replacing any existing file"""
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f)
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,98 @@
+"""
+Persistent birth aggregates that only ingest rows appended to the CSV
+
+Historical CDC data never changes; new years are appended to the end of
+the file. The store remembers how many bytes of the CSV it has already
+aggregated, and on refresh it parses only the bytes after that point and
+merges them into the saved sums and counts. If anything before that point
+changed, the store is rebuilt from scratch.
+"""
+import os
+import pickle
+
+import pandas as pd
+
+from aggregates import BirthAggregates
+from births_cache import cache_path, file_digest, file_signature
+from data_loader import aggregate_births_csv, build_feature_frame
+
+STORE_VERSION = 1
+STORE_FILE = 'aggregates.pkl'
+
+class AggregateStore:
+    """BirthAggregates for one CSV file, kept up to date incrementally"""
+
+    def __init__(self, filename, store_path=None, chunksize=1_000_000):
+        self.filename = filename
+        self.store_path = store_path or os.path.join(cache_path(filename), STORE_FILE)
+        self.chunksize = chunksize
+        self.aggregates = BirthAggregates()
+        self.source = None
+        self._load()
+
+    def refresh(self):
+        """Bring the aggregates up to date with the CSV and return them"""
+        size, mtime_ns = file_signature(self.filename)
+        source = self.source
+
+        if source is not None and size == source['offset'] and mtime_ns == source['mtime_ns']:
+            return self.aggregates
+
+        prefix = None
+        if source is not None and size >= source['offset']:
+            prefix = file_digest(self.filename, source['offset'])
+
+        if prefix is not None and prefix.hexdigest() == source['prefix_sha256']:
+            # Only new rows were appended (or the file was just touched):
+            # aggregate the tail and merge it into the affected groups, and
+            # extend the prefix hash over the tail instead of rereading it
+            if size > source['offset']:
+                self.aggregates = self.aggregates.merge(self._aggregate_tail(source['offset']))
+            digest = file_digest(self.filename, size - source['offset'], source['offset'], prefix.copy())
+        else:
+            self.aggregates = aggregate_births_csv(self.filename, self.chunksize)
+            source = {'columns': list(pd.read_csv(self.filename, nrows=0).columns)}
+            digest = file_digest(self.filename, size)
+
+        self.source = dict(source, offset=size, mtime_ns=mtime_ns,
+                           prefix_sha256=digest.hexdigest())
+        self.save()
+        return self.aggregates
+
+    def add_rows(self, data):
+        """Merge rows that are not part of the CSV (e.g. a separate new-year file)"""
+        self.aggregates = self.aggregates.merge(BirthAggregates.from_frame(build_feature_frame(data)))
+        self.save()
+        return self.aggregates
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        state = {'version': STORE_VERSION, 'source': self.source,
+                 'rows': self.aggregates.rows, 'tables': self.aggregates.tables}
+        with open(self.store_path + '.tmp', 'wb') as f:
+            pickle.dump(state, f)
+        os.replace(self.store_path + '.tmp', self.store_path)
+
+    def _load(self):
+        try:
+            with open(self.store_path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if state.get('version') == STORE_VERSION:
+            self.source = state['source']
+            self.aggregates = BirthAggregates(state['tables'], state['rows'])
+
+    def _aggregate_tail(self, offset):
+        totals = BirthAggregates()
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            chunks = pd.read_csv(f, header=None, names=self.source['columns'],
+                                 chunksize=self.chunksize)
+            for chunk in chunks:
+                totals = totals.merge(BirthAggregates.from_frame(build_feature_frame(chunk)))
+        return totals
+
+def load_aggregates(filename='CDCbirths.csv', chunksize=1_000_000):
+    """Aggregates for the CSV, reading only rows added since the last call"""
+    return AggregateStore(filename, chunksize=chunksize).refresh()
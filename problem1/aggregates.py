@@ -0,0 +1,61 @@
+"""
+Mergeable birth aggregates for data that does not fit in memory
+
+A BirthAggregates object keeps the sum of births and the number of rows for
+every group the reports use. Partial aggregates from separate chunks can be
+merged, and because counts are kept alongside sums the means stay exact.
+"""
+import pandas as pd
+
+# name -> (group keys, only rows with a valid calendar date)
+GROUPINGS = {
+    'year': (['year'], False),
+    'decade_gender': (['decade', 'gender'], False),
+    'decade_weekday': (['decade', 'weekday'], True),
+    'month_day': (['month', 'day'], True)
+}
+
+class BirthAggregates:
+    """Sums and counts of births per year, decade/gender, decade/weekday and month/day"""
+
+    def __init__(self, tables=None, rows=0):
+        self.tables = tables or {}
+        self.rows = rows
+
+    @classmethod
+    def from_frame(cls, data):
+        """Aggregate a feature frame (see data_loader.build_feature_frame)"""
+        valid_rows = data[data['valid_date']]
+        tables = {}
+        for name, (keys, valid_only) in GROUPINGS.items():
+            rows = valid_rows if valid_only else data
+            # Plain int64 keys so chunks with and without missing days line up
+            group_keys = [rows[key] if key == 'gender' else rows[key].astype('int64')
+                          for key in keys]
+            tables[name] = rows.groupby(group_keys, observed=True)['births'].agg(
+                births='sum', count='size')
+        return cls(tables, len(data))
+
+    def merge(self, other):
+        """Combine two partial aggregates into a new one"""
+        if not self.tables:
+            return other
+        if not other.tables:
+            return self
+        tables = {}
+        for name, (keys, _) in GROUPINGS.items():
+            combined = pd.concat([self.tables[name], other.tables[name]])
+            tables[name] = combined.groupby(level=keys, observed=True).sum()
+        return BirthAggregates(tables, self.rows + other.rows)
+
+    def sums(self, name):
+        """Total births per group"""
+        return self.tables[name]['births']
+
+    def means(self, name):
+        """Average births per row in each group"""
+        table = self.tables[name]
+        return table['births'] / table['count']
+
+    def __len__(self):
+        return self.rows
@@ -0,0 +1,164 @@
+"""
+Binary column cache for the CDC births CSV
+
+The first load parses the CSV with pandas and writes every column as an
+uncompressed .npy file in a cache directory next to the source. Later loads
+memory-map those files instead of parsing the text again, as long as the
+source file has not changed (same size and mtime, or same SHA-256 hash).
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from config import CACHE_DIR, CACHE_DTYPES
+from json_files import read_json, write_json
+
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+
+
+def file_signature(filename):
+    """Return the (size, mtime in ns) pair used as the cheap cache key"""
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+def file_digest(filename, length=None, offset=0, digest=None, block_size=1 << 20):
+    """Feed length bytes of the file from offset (or the rest of it) into a SHA-256
+
+    Continues digest when given, so a prefix hash can be extended over
+    bytes appended later without reading the prefix again.
+    """
+    digest = digest or hashlib.sha256()
+    remaining = length
+    with open(filename, 'rb') as f:
+        f.seek(offset)
+        while remaining is None or remaining > 0:
+            size = block_size if remaining is None else min(block_size, remaining)
+            block = f.read(size)
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest
+
+def file_hash(filename, length=None, block_size=1 << 20):
+    """SHA-256 of the file contents (or of the first length bytes), read in blocks"""
+    return file_digest(filename, length, block_size=block_size).hexdigest()
+
+def cache_path(filename):
+    """Cache directory used for a given CSV file"""
+    source_dir, source_name = os.path.split(os.path.abspath(filename))
+    return os.path.join(source_dir, CACHE_DIR, source_name)
+
+def downcast_columns(data):
+    """Apply the compact dtypes from config.CACHE_DTYPES where values fit"""
+    data = data.copy()
+    for column, dtype in CACHE_DTYPES.items():
+        if column not in data.columns:
+            continue
+        if dtype == 'category':
+            data[column] = data[column].astype('category')
+            continue
+        values = data[column].dropna()
+        info = np.iinfo(dtype)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            continue
+        if data[column].isna().any():
+            # Keep missing values (e.g. unknown day) with a nullable integer
+            data[column] = data[column].astype(dtype.capitalize())
+        else:
+            data[column] = data[column].astype(dtype)
+    return data
+
+def save_columns(data, cache_dir, meta):
+    """Write each column of a DataFrame as a .npy file plus a JSON manifest"""
+    os.makedirs(cache_dir, exist_ok=True)
+    tag = meta.get('sha256', 'frame')[:16]
+    columns = []
+
+    for i, column in enumerate(data.columns):
+        series = data[column]
+        entry = {'name': column, 'file': f'{i}.{tag}.npy'}
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['kind'] = 'category'
+            entry['categories'] = [str(c) for c in series.cat.categories]
+            values = series.cat.codes.to_numpy()
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufM':
+            entry['kind'] = 'plain'
+            values = series.to_numpy()
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            # Nullable integers are stored as values plus a missing-value mask
+            entry['kind'] = 'masked'
+            entry['mask_file'] = f'{i}.{tag}.mask.npy'
+            values = series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0)
+            np.save(os.path.join(cache_dir, entry['mask_file']), series.isna().to_numpy())
+        else:
+            # Text columns are stored as category codes
+            entry['kind'] = 'category'
+            categorical = series.astype('category')
+            entry['categories'] = [str(c) for c in categorical.cat.categories]
+            values = categorical.cat.codes.to_numpy()
+
+        np.save(os.path.join(cache_dir, entry['file']), values)
+        columns.append(entry)
+
+    meta = dict(meta, version=CACHE_VERSION, rows=len(data), columns=columns)
+    write_json(os.path.join(cache_dir, META_FILE), meta)
+    _remove_stale_files(cache_dir, meta)
+    return meta
+
+def load_columns(cache_dir, meta=None):
+    """Rebuild a DataFrame from a cache directory using memory-mapped arrays"""
+    if meta is None:
+        meta = read_json(os.path.join(cache_dir, META_FILE))
+
+    columns = {}
+    for entry in meta['columns']:
+        values = np.load(os.path.join(cache_dir, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'category':
+            columns[entry['name']] = pd.Categorical.from_codes(values, entry['categories'])
+        elif entry['kind'] == 'masked':
+            mask = np.load(os.path.join(cache_dir, entry['mask_file']), mmap_mode='r')
+            columns[entry['name']] = pd.arrays.IntegerArray(np.asarray(values), np.asarray(mask))
+        else:
+            columns[entry['name']] = values
+
+    return pd.DataFrame(columns, copy=False)
+
+def read_cached_csv(filename):
+    """Load a CSV through the column cache, rebuilding it when the file changed"""
+    cache_dir = cache_path(filename)
+    meta = read_json(os.path.join(cache_dir, META_FILE))
+    size, mtime_ns = file_signature(filename)
+
+    if meta is not None and meta.get('version') == CACHE_VERSION and meta['size'] == size:
+        if meta['mtime_ns'] == mtime_ns:
+            return load_columns(cache_dir, meta)
+
+        # Same size but touched: only trust the cache if the contents match
+        if meta['sha256'] == file_hash(filename):
+            meta['mtime_ns'] = mtime_ns
+            write_json(os.path.join(cache_dir, META_FILE), meta)
+            return load_columns(cache_dir, meta)
+
+    data = downcast_columns(pd.read_csv(filename))
+    source = {'size': size, 'mtime_ns': mtime_ns, 'sha256': file_hash(filename)}
+    try:
+        save_columns(data, cache_dir, source)
+    except OSError:
+        # A read-only data directory should not stop the analysis
+        pass
+    return data
+
+def _remove_stale_files(cache_dir, meta):
+    keep = {META_FILE}
+    for entry in meta['columns']:
+        keep.add(entry['file'])
+        keep.add(entry.get('mask_file'))
+    for name in os.listdir(cache_dir):
+        if name.endswith('.npy') and name not in keep:
+            os.remove(os.path.join(cache_dir, name))
@@ -0,0 +1,69 @@
+"""
+Precomputed calendar table indexed by (year, month, day)
+
+Every (year, month, day) combination in a range of years gets one slot in
+flat arrays holding its validity, date, weekday and day of the year, all
+computed once with the arithmetic in dates.py. Deriving those columns for
+any number of rows is then one integer slot computation and a gather per
+column from a table small enough to stay in cache (416 slots per year).
+Months outside 1-12, days outside 1-31 and years outside the range land in
+a trailing invalid slot.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+import dates
+
+MONTH_SLOTS = 13    # month 0 is a padding row so months index directly
+DAY_SLOTS = 32      # likewise day 0
+YEAR_SLOTS = MONTH_SLOTS * DAY_SLOTS
+
+# 'MM-DD' label for every (month, day) slot, used for per-date tables
+MONTH_DAY_LABELS = np.array([[f'{month:02d}-{day:02d}' for day in range(DAY_SLOTS)]
+                             for month in range(MONTH_SLOTS)])
+
+class CalendarIndex:
+    """Validity, date, weekday and day of year for every date in [first_year, last_year]"""
+
+    def __init__(self, first_year, last_year):
+        self.first_year = int(first_year)
+        self.last_year = int(last_year)
+        n_years = self.last_year - self.first_year + 1
+
+        year, month, day = np.meshgrid(np.arange(self.first_year, self.last_year + 1),
+                                       np.arange(MONTH_SLOTS), np.arange(DAY_SLOTS),
+                                       indexing='ij')
+        year, month, day = year.ravel(), month.ravel(), day.ravel()
+        valid = dates.is_valid_date(year, month, day)
+        days = dates.days_since_epoch(year, month, day)
+
+        # One extra slot at the end for anything out of range
+        self._invalid_slot = n_years * YEAR_SLOTS
+        self.valid = np.append(valid, False)
+        self.date = np.append(np.where(valid, days, np.iinfo(np.int64).min),
+                              np.iinfo(np.int64).min).astype('datetime64[D]')
+        self.weekday = np.append(np.where(valid, dates.weekday(days), -1), -1).astype(np.int8)
+        self.day_of_year = np.append(np.where(valid, dates.day_of_year(year, month, day), 0),
+                                     0).astype(np.int16)
+
+    def slots(self, year, month, day):
+        """Table position of each (year, month, day) row"""
+        year = np.asarray(year, dtype=np.intp) - self.first_year
+        month = np.asarray(month, dtype=np.intp)
+        day = np.asarray(day, dtype=np.intp)
+        slots = (year * MONTH_SLOTS + month) * DAY_SLOTS + day
+        in_range = ((year >= 0) & (year <= self.last_year - self.first_year)
+                    & (month >= 0) & (month < MONTH_SLOTS) & (day >= 0) & (day < DAY_SLOTS))
+        if not in_range.all():
+            slots[~in_range] = self._invalid_slot
+        return slots
+
+@lru_cache(maxsize=8)
+def calendar_index(first_year, last_year):
+    """Shared CalendarIndex for a year range (built once per range)"""
+    return CalendarIndex(first_year, last_year)
+
+def month_day_labels(month, day):
+    """'MM-DD' strings for month/day arrays of real dates, by table lookup"""
+    return MONTH_DAY_LABELS[np.asarray(month, dtype=np.intp), np.asarray(day, dtype=np.intp)]
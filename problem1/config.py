@@ -5,14 +5,33 @@ Configuration settings for the CDC births analysis
 # Data file settings
 DATA_FILE = 'CDCbirths.csv'
 
+# Binary column cache written next to the CSV on first load
+CACHE_DIR = '.births_cache'
+CACHE_DTYPES = {
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'gender': 'category'
+}
+
 # Plot settings
 PLOT_STYLE = {
     'figure_size': (12, 6),
+    'weekday_figure_size': (16, 5),
+    'seasonal_figure_size': (14, 7),
     'line_width': 2,
     'grid_alpha': 0.3,
     'dpi': 150
 }
 
+# Output settings
+HEADLESS = False          # Render with Agg on explicit figures and never call plt.show()
+OUTPUT_FORMATS = ['png']  # Each figure is saved once per format
+
+# Headless runs skip rendering a figure whose data and style are unchanged
+FIGURE_CACHE = True
+FIGURE_CACHE_DIR = '.figure_cache'  # Manifest, one JSON entry per figure
+
 # Analysis settings
 WEEKDAY_DECADES = [1960, 1970, 1980]  # Decades to analyze for weekday patterns
 WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
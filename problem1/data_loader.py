@@ -3,9 +3,26 @@ Data loading and basic exploration functions for CDC births dataset
 """
 import pandas as pd
 
-def load_and_explore_data(filename='CDCbirths.csv'):
-    """Load the CDC births dataset and return basic information"""
-    data = pd.read_csv(filename)
+from aggregates import BirthAggregates
+from births_cache import read_cached_csv
+from calendar_index import calendar_index
+
+def load_and_explore_data(filename='CDCbirths.csv', use_cache=True, chunksize=None):
+    """Load the CDC births dataset and return basic information
+
+    With use_cache the CSV is parsed once and later loads memory-map the
+    binary column cache (see births_cache.py) with compact dtypes.
+
+    With chunksize the file is streamed instead and a BirthAggregates object
+    is returned, which every analysis function accepts in place of a frame.
+    """
+    if chunksize:
+        return aggregate_births_csv(filename, chunksize)
+
+    if use_cache:
+        data = read_cached_csv(filename)
+    else:
+        data = pd.read_csv(filename)
     
     # Store basic information for reporting
     dataset_info = {
@@ -17,8 +34,44 @@ def load_and_explore_data(filename='CDCbirths.csv'):
     
     return data
 
-def prepare_data_with_decades(data):
-    """Add decade column for easier decade-based analysis"""
-    data_copy = data.copy()
-    data_copy['decade'] = (data_copy['year'] // 10) * 10
-    return data_copy
\ No newline at end of file
+def build_feature_frame(data):
+    """Add the derived columns shared by every analysis, computed once
+
+    Adds decade, valid_date, date, weekday (Monday=0) and day_of_year by
+    gathering from a precomputed calendar table (see calendar_index). The
+    analysis modules only read this frame, so a full run works from a single
+    prepared copy.
+    """
+    year = data['year'].to_numpy()
+    first_year, last_year = (int(year.min()), int(year.max())) if len(year) else (1970, 1970)
+    calendar = calendar_index(first_year, last_year)
+    slots = calendar.slots(year, data['month'].to_numpy(), data['day'].fillna(0).to_numpy())
+
+    return data.assign(
+        decade=(data['year'] // 10) * 10,
+        valid_date=calendar.valid[slots],
+        date=calendar.date[slots],
+        weekday=calendar.weekday[slots],
+        day_of_year=calendar.day_of_year[slots]
+    )
+
+def ensure_feature_frame(data, columns=('decade', 'valid_date', 'weekday')):
+    """The frame itself if it has the derived columns, else build_feature_frame(data)
+
+    Lets the analyses accept the plain frame from load_and_explore_data as
+    well as a prepared feature frame.
+    """
+    if all(column in data.columns for column in columns):
+        return data
+    return build_feature_frame(data)
+
+def aggregate_births_csv(filename, chunksize=1_000_000):
+    """Stream the CSV in chunks and merge per-chunk aggregates
+
+    Peak memory depends on the chunk size and the number of groups, not on
+    the size of the file.
+    """
+    totals = BirthAggregates()
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        totals = totals.merge(BirthAggregates.from_frame(build_feature_frame(chunk)))
+    return totals
@@ -0,0 +1,42 @@
+"""
+Vectorized calendar arithmetic on integer year/month/day arrays
+
+Everything here works on NumPy integer arrays so dates can be validated and
+converted without building per-row strings or calling pd.to_datetime.
+"""
+import numpy as np
+
+DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+DAYS_BEFORE_MONTH = np.array([0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334])
+
+def is_leap_year(year):
+    """Gregorian leap year test"""
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+def days_in_month(year, month):
+    """Number of days in each month, 0 for month numbers outside 1-12"""
+    month = np.where((month >= 1) & (month <= 12), month, 0)
+    return DAYS_IN_MONTH[month] + ((month == 2) & is_leap_year(year))
+
+def is_valid_date(year, month, day):
+    """True where (year, month, day) is a real calendar date"""
+    return (day >= 1) & (day <= days_in_month(year, month))
+
+def day_of_year(year, month, day):
+    """1-based day of the year (only meaningful for valid dates)"""
+    month = np.clip(month, 1, 12)
+    return DAYS_BEFORE_MONTH[month] + day + ((month > 2) & is_leap_year(year))
+
+def days_since_epoch(year, month, day):
+    """Days since 1970-01-01 using the civil-from-days algorithm"""
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    shifted_month = (month + 9) % 12
+    day_of_era_year = (153 * shifted_month + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_era_year
+    return era * 146097 + day_of_era - 719468
+
+def weekday(days):
+    """Weekday with Monday=0 for days since the epoch (1970-01-01 was a Thursday)"""
+    return (days + 3) % 7
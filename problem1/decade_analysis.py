@@ -3,21 +3,32 @@ Functions for analyzing birth patterns by decade and gender
 """
 import pandas as pd
 
+from aggregates import BirthAggregates
+
+def decade_gender_summary(data):
+    """Female, male and total births per decade from a single grouped sum
+
+    Works on a raw or feature frame (decade is derived from year if the
+    column is missing) or on BirthAggregates. The input is never modified.
+    """
+    if isinstance(data, BirthAggregates):
+        by_gender = data.sums('decade_gender').unstack(fill_value=0)
+    else:
+        if 'decade' in data.columns:
+            decades = data['decade']
+        else:
+            decades = ((data['year'] // 10) * 10).rename('decade')
+        by_gender = data.groupby([decades, data['gender']], observed=True)['births'].sum()
+        by_gender = by_gender.unstack(fill_value=0)
+
+    by_gender.columns = by_gender.columns.astype(str)
+    summary = pd.DataFrame({
+        'female': by_gender.get('F', 0),
+        'male': by_gender.get('M', 0)
+    })
+    summary['total'] = summary['female'] + summary['male']
+    return summary
+
 def births_by_decade_analysis(data):
     """Analyze births by decade and gender"""
-    # Group by decade for easier analysis
-    data['decade'] = (data['year'] // 10) * 10
-    
-    # Create summary table
-    summary_table = data.groupby(['decade', 'gender'])['births'].sum().unstack(fill_value=0)
-    
-    # Calculate totals for each decade
-    decade_totals = {}
-    for decade in sorted(data['decade'].unique()):
-        decade_subset = data[data['decade'] == decade]
-        females = decade_subset[decade_subset['gender'] == 'F']['births'].sum()
-        males = decade_subset[decade_subset['gender'] == 'M']['births'].sum()
-        total = females + males
-        decade_totals[decade] = {'female': females, 'male': males, 'total': total}
-    
-    return data
\ No newline at end of file
+    return decade_gender_summary(data)
@@ -0,0 +1,155 @@
+"""
+Skip-if-unchanged cache for the report figures
+
+A figure's key is a SHA-256 over the reduced data it plots, the style
+settings from config.py, the output formats, the matplotlib version and
+the source of the function that draws it. The manifest keeps one JSON
+entry per figure in FIGURE_CACHE_DIR, holding:
+- the key
+- the size and mtime of each saved file
+- how long the last render took
+- running counts of hits and misses
+- the rendering time the hits saved
+
+When the key matches and the saved files are untouched, the figure does
+not need rendering again. Each figure has its own entry file, so
+analyses running in parallel workers never write the same file.
+"""
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import config
+from births_cache import file_signature
+from json_files import read_json, write_json
+
+CACHE_VERSION = 2
+
+# config.py settings that change how a figure looks
+STYLE_SETTINGS = ['PLOT_STYLE', 'WEEKDAY_COLORS', 'SEASONAL_COLORS', 'MONTH_NAMES',
+                  'WEEKDAY_ORDER', 'WEEKDAY_DECADES']
+
+
+def _normalized(values):
+    """Values as int64 or float64, so the storage dtype does not change the hash"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'biu':
+        return values.astype(np.int64)
+    if values.dtype.kind == 'f':
+        return values.astype(np.float64)
+    return values
+
+def _normalized_index(index):
+    if isinstance(index, pd.MultiIndex):
+        return pd.MultiIndex.from_arrays([_normalized(index.get_level_values(level))
+                                          for level in range(index.nlevels)], names=index.names)
+    return pd.Index(_normalized(index), name=index.name)
+
+def plot_data_hash(digest, value):
+    """Feed one piece of plot data (pandas object, array or plain value) into digest
+
+    Numbers are hashed as int64 or float64, so the same plotted values give
+    the same key whether they come from a downcast frame or from aggregates.
+    """
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        digest.update(repr((type(value).__name__, list(frame.columns))).encode())
+        normalized = pd.DataFrame({i: _normalized(frame.iloc[:, i]) for i in range(frame.shape[1])},
+                                  index=_normalized_index(frame.index))
+        digest.update(pd.util.hash_pandas_object(normalized, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        value = _normalized(value)
+        digest.update(f'{value.dtype.str}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+def figure_key(basename, figsize, draw, plot_data):
+    """Hash of everything a saved figure depends on"""
+    import matplotlib
+
+    digest = hashlib.sha256()
+    style = {name: getattr(config, name) for name in STYLE_SETTINGS}
+    digest.update(json.dumps({
+        'version': CACHE_VERSION,
+        'basename': basename,
+        'figsize': figsize,
+        'formats': config.OUTPUT_FORMATS,
+        'style': style,
+        'matplotlib': matplotlib.__version__
+    }, sort_keys=True, default=repr).encode())
+    digest.update(inspect.getsource(draw).encode())
+    for value in plot_data:
+        plot_data_hash(digest, value)
+    return digest.hexdigest()
+
+def output_files(basename):
+    return [f'{basename}.{fmt}' for fmt in config.OUTPUT_FORMATS]
+
+def entry_path(basename):
+    return os.path.join(config.FIGURE_CACHE_DIR, f'{os.path.basename(basename)}.json')
+
+def read_entry(basename):
+    """Manifest entry of a figure, or None"""
+    return read_json(entry_path(basename))
+
+def write_entry(basename, entry):
+    try:
+        os.makedirs(config.FIGURE_CACHE_DIR, exist_ok=True)
+        write_json(entry_path(basename), entry)
+    except OSError:
+        # A read-only output directory only costs the render next time
+        pass
+
+def is_current(entry, key):
+    """True when the entry has this key and its saved files are untouched"""
+    if entry is None or entry.get('key') != key:
+        return False
+    try:
+        return all(list(file_signature(path)) == entry['files'].get(path)
+                   for path in output_files(entry['basename']))
+    except OSError:
+        return False
+
+def record_hit(entry):
+    entry['hits'] += 1
+    entry['seconds_saved'] += entry['render_seconds']
+    write_entry(entry['basename'], entry)
+
+def record_render(basename, key, seconds, previous=None):
+    """Store a fresh render's key, file signatures and time, keeping the counters"""
+    previous = previous or {'hits': 0, 'misses': 0, 'seconds_saved': 0.0}
+    entry = {
+        'basename': basename,
+        'key': key,
+        'files': {path: list(file_signature(path)) for path in output_files(basename)},
+        'render_seconds': seconds,
+        'hits': previous['hits'],
+        'misses': previous['misses'] + 1,
+        'seconds_saved': previous['seconds_saved']
+    }
+    write_entry(basename, entry)
+    return entry
+
+def manifest_summary(cache_dir=None):
+    """Hits, misses and seconds saved over all figures in the manifest"""
+    cache_dir = cache_dir or config.FIGURE_CACHE_DIR
+    summary = {'figures': 0, 'hits': 0, 'misses': 0, 'seconds_saved': 0.0}
+    try:
+        names = sorted(os.listdir(cache_dir))
+    except OSError:
+        return summary
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        entry = read_json(os.path.join(cache_dir, name))
+        if entry is None:
+            continue
+        summary['figures'] += 1
+        for counter in ('hits', 'misses', 'seconds_saved'):
+            summary[counter] += entry[counter]
+    return summary
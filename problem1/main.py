@@ -4,13 +4,17 @@ Main script to run all CDC births data analyses
 This script coordinates the different analysis modules to provide
 a comprehensive look at birth patterns in the CDC dataset.
 """
+import argparse
 import sys
 import os
 
 # Add the current directory to path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for the shared instrumentation module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_loader import load_and_explore_data
+from instrumentation import PROFILER
+from data_loader import load_and_explore_data, build_feature_frame
 from decade_analysis import births_by_decade_analysis
 from yearly_trends import yearly_birth_trends
 from weekday_patterns import weekday_birth_patterns
@@ -19,16 +23,40 @@ from seasonal_analysis import seasonal_birth_analysis
 def main():
     """Run the complete analysis pipeline"""
     # Load and explore the dataset
-    birth_data = load_and_explore_data('CDCbirths.csv')
+    with PROFILER.stage('load_and_explore_data') as stage:
+        birth_data = load_and_explore_data('CDCbirths.csv')
+        stage['rows'] = len(birth_data)
+    rows = len(birth_data)
+    
+    # Derive decade, date and weekday columns once for every analysis
+    with PROFILER.stage('build_feature_frame', rows):
+        birth_data = build_feature_frame(birth_data)
     
     # Run each analysis module
-    birth_data = births_by_decade_analysis(birth_data)
-    yearly_trends = yearly_birth_trends(birth_data)  
-    weekday_patterns = weekday_birth_patterns(birth_data)
-    seasonal_patterns = seasonal_birth_analysis(birth_data)
+    with PROFILER.stage('births_by_decade_analysis', rows):
+        decade_summary = births_by_decade_analysis(birth_data)
+    with PROFILER.stage('yearly_birth_trends', rows):
+        yearly_trends = yearly_birth_trends(birth_data)
+    with PROFILER.stage('weekday_birth_patterns', rows):
+        weekday_patterns = weekday_birth_patterns(birth_data)
+    with PROFILER.stage('seasonal_birth_analysis', rows):
+        seasonal_patterns = seasonal_birth_analysis(birth_data)
     
     # Analysis complete - visualizations saved to PNG files
-    return birth_data, yearly_trends, weekday_patterns, seasonal_patterns
+    return birth_data, decade_summary, yearly_trends, weekday_patterns, seasonal_patterns
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Run all CDC births analyses')
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='Record per-stage time and memory to PATH (*.json: Chrome trace, '
+                             'otherwise JSON lines)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also trace allocations per stage (slower)')
+    args = parser.parse_args()
+    
+    if args.profile:
+        PROFILER.enable(trace_memory=args.profile_memory)
+    main()
+    if args.profile:
+        PROFILER.write(args.profile)
+        print(PROFILER.summary())
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Figure creation, saving and cleanup shared by the plotting analyses
+"""
+import gc
+import time
+from contextlib import contextmanager
+
+import config
+
+def new_figure(figsize, nrows=1, ncols=1):
+    """Create a figure and its axes
+
+    In headless mode this builds an explicit Figure on an Agg canvas, so
+    pyplot's global figure list and interactive backends are never used.
+    """
+    if config.HEADLESS:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        return fig, fig.subplots(nrows, ncols)
+
+    import matplotlib.pyplot as plt
+    return plt.subplots(nrows, ncols, figsize=figsize)
+
+def save_figure(fig, basename):
+    """Save the figure once per configured output format"""
+    for fmt in config.OUTPUT_FORMATS:
+        fig.savefig(f'{basename}.{fmt}', dpi=config.PLOT_STYLE['dpi'], bbox_inches='tight')
+
+def close_figure(fig):
+    """Release a figure so repeated reports don't accumulate memory"""
+    if config.HEADLESS:
+        # Figures hold reference cycles that otherwise wait for a full collection
+        fig.clear()
+        gc.collect()
+    else:
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+
+@contextmanager
+def report_figure(basename, figsize, nrows=1, ncols=1):
+    """Create a figure, then save, show (unless headless) and always close it"""
+    fig, axes = new_figure(figsize, nrows, ncols)
+    try:
+        yield fig, axes
+        fig.tight_layout()
+        save_figure(fig, basename)
+        if not config.HEADLESS:
+            import matplotlib.pyplot as plt
+            plt.show()
+    finally:
+        close_figure(fig)
+
+def cached_figure(basename, figsize, draw, plot_data, nrows=1, ncols=1):
+    """report_figure around draw(fig, axes), skipped when its output is current
+
+    plot_data is a sequence of what the figure shows (Series, DataFrames,
+    arrays). In headless mode, with config.FIGURE_CACHE on, the figure is
+    only rendered when figure_cache finds its key or its saved files
+    changed; an interactive run always renders, since it shows the figure.
+    Returns True when the existing files were reused.
+    """
+    if not (config.HEADLESS and config.FIGURE_CACHE):
+        with report_figure(basename, figsize, nrows, ncols) as (fig, axes):
+            draw(fig, axes)
+        return False
+
+    import figure_cache
+
+    key = figure_cache.figure_key(basename, figsize, draw, plot_data)
+    entry = figure_cache.read_entry(basename)
+    if figure_cache.is_current(entry, key):
+        figure_cache.record_hit(entry)
+        return True
+
+    start = time.perf_counter()
+    with report_figure(basename, figsize, nrows, ncols) as (fig, axes):
+        draw(fig, axes)
+    figure_cache.record_render(basename, key, time.perf_counter() - start, entry)
+    return False
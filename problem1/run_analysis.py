@@ -1,61 +1,186 @@
 import argparse
+import importlib
 import sys
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for the shared instrumentation module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_loader import load_and_explore_data
-from decade_analysis import births_by_decade_analysis
-from yearly_trends import yearly_birth_trends
-from weekday_patterns import weekday_birth_patterns
-from seasonal_analysis import seasonal_birth_analysis
+import config
+from instrumentation import PROFILER
+
+# Analyses in the order they are run and reported: (name, title, module,
+# function, help). Modules are imported only when their analysis is selected,
+# so e.g. --decade never loads matplotlib; pandas and the loaders are likewise
+# imported inside the functions below rather than at startup.
+ANALYSES = [
+    ('decade', 'RUNNING DECADE ANALYSIS', 'decade_analysis', 'births_by_decade_analysis',
+     'Run decade analysis'),
+    ('yearly', 'RUNNING YEARLY TRENDS ANALYSIS', 'yearly_trends', 'yearly_birth_trends',
+     'Run yearly trends analysis'),
+    ('weekday', 'RUNNING WEEKDAY PATTERNS ANALYSIS', 'weekday_patterns', 'weekday_birth_patterns',
+     'Run weekday patterns analysis'),
+    ('seasonal', 'RUNNING SEASONAL ANALYSIS', 'seasonal_analysis', 'seasonal_birth_analysis',
+     'Run seasonal analysis')
+]
+
+def load_analysis(name):
+    """Import the module of a registered analysis and return its function"""
+    for key, _, module, function, _ in ANALYSES:
+        if key == name:
+            return getattr(importlib.import_module(module), function)
+    raise KeyError(f'unknown analysis: {name}')
+
+# Feature frame loaded once per worker process
+_worker_data = None
+
+def print_header(title):
+    print("\n" + "="*60)
+    print(title)
+    print("="*60)
+
+def _init_worker(shared, output_formats, profile=False, figure_cache=True):
+    """Render headless (Agg) in the worker and memory-map the shared frame
+
+    shared is either the directory holding the frame's columns or, in
+    streaming mode, the (small) BirthAggregates object itself.
+    """
+    from births_cache import load_columns
+
+    global _worker_data
+    config.HEADLESS = True
+    config.OUTPUT_FORMATS = output_formats
+    config.FIGURE_CACHE = figure_cache
+    if profile:
+        # Forked workers inherit the parent's records; report only their own
+        PROFILER.drain()
+        PROFILER.enable()
+    _worker_data = load_columns(shared) if isinstance(shared, str) else shared
+
+def _run_in_worker(name):
+    """Run one analysis; returns its result and the worker's profile records"""
+    analysis = load_analysis(name)
+    with PROFILER.stage(analysis.__name__, len(_worker_data)):
+        result = analysis(_worker_data)
+    return result, PROFILER.drain()
+
+def run_parallel(data, selected, jobs):
+    """Run the selected analyses in a process pool sharing one mapped frame"""
+    from aggregates import BirthAggregates
+    from births_cache import save_columns
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='births_shared_') as shared_dir:
+        if isinstance(data, BirthAggregates):
+            shared = data
+        else:
+            # Workers memory-map these columns instead of unpickling the frame
+            save_columns(data, shared_dir, {})
+            shared = shared_dir
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(shared, config.OUTPUT_FORMATS, PROFILER.enabled,
+                                           config.FIGURE_CACHE)) as pool:
+            futures = [(name, title, pool.submit(_run_in_worker, name))
+                       for name, title, *_ in selected]
+            for name, title, future in futures:
+                print_header(title)
+                results[name], records = future.result()
+                PROFILER.records.extend(records)
+    return results
 
 def run_selected_analyses(args):
     """Run only the selected analysis components"""
-    
+
     # Always load data first
-    data = load_and_explore_data('CDCbirths.csv')
-    
-    if args.all or args.decade:
-        print("\n" + "="*60)
-        print("RUNNING DECADE ANALYSIS")
-        print("="*60)
-        data = births_by_decade_analysis(data)
-    
-    if args.all or args.yearly:
-        print("\n" + "="*60)
-        print("RUNNING YEARLY TRENDS ANALYSIS")
-        print("="*60)
-        yearly_birth_trends(data)
-    
-    if args.all or args.weekday:
-        print("\n" + "="*60)
-        print("RUNNING WEEKDAY PATTERNS ANALYSIS")
-        print("="*60)
-        weekday_birth_patterns(data)
-    
-    if args.all or args.seasonal:
-        print("\n" + "="*60)
-        print("RUNNING SEASONAL ANALYSIS")
-        print("="*60)
-        seasonal_birth_analysis(data)
+    if args.incremental:
+        from aggregate_store import load_aggregates
+
+        # Saved aggregates, updated with any rows appended since the last run
+        with PROFILER.stage('load_aggregates') as stage:
+            data = load_aggregates('CDCbirths.csv', chunksize=args.chunksize or 1_000_000)
+            stage['rows'] = len(data)
+    elif args.chunksize:
+        from data_loader import load_and_explore_data
+
+        # Out-of-core: stream the CSV into aggregates instead of a frame
+        with PROFILER.stage('aggregate_births_csv') as stage:
+            data = load_and_explore_data('CDCbirths.csv', chunksize=args.chunksize)
+            stage['rows'] = len(data)
+    else:
+        from data_loader import load_and_explore_data, build_feature_frame
+
+        with PROFILER.stage('load_and_explore_data') as stage:
+            data = load_and_explore_data('CDCbirths.csv')
+            stage['rows'] = len(data)
+        with PROFILER.stage('build_feature_frame', len(data)):
+            data = build_feature_frame(data)
+
+    selected = [entry for entry in ANALYSES if args.all or getattr(args, entry[0])]
+
+    if args.jobs > 1:
+        return run_parallel(data, selected, args.jobs)
+
+    results = {}
+    for name, title, *_ in selected:
+        print_header(title)
+        analysis = load_analysis(name)
+        with PROFILER.stage(analysis.__name__, len(data)):
+            results[name] = analysis(data)
+    return results
 
 def main():
     parser = argparse.ArgumentParser(description='Run CDC births data analysis')
     parser.add_argument('--all', action='store_true', help='Run all analyses')
-    parser.add_argument('--decade', action='store_true', help='Run decade analysis')
-    parser.add_argument('--yearly', action='store_true', help='Run yearly trends analysis')
-    parser.add_argument('--weekday', action='store_true', help='Run weekday patterns analysis')
-    parser.add_argument('--seasonal', action='store_true', help='Run seasonal analysis')
-    
+    for name, _, _, _, help_text in ANALYSES:
+        parser.add_argument(f'--{name}', action='store_true', help=help_text)
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Run analyses in N worker processes (Agg backend)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Stream the CSV in chunks of N rows into aggregates')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Use the persistent aggregate store, ingesting only appended rows')
+    parser.add_argument('--headless', action='store_true',
+                        help='Render with Agg and never call plt.show()')
+    parser.add_argument('--format', dest='formats', action='append',
+                        help='Output format for figures (repeatable, default png)')
+    parser.add_argument('--no-figure-cache', action='store_true',
+                        help='Re-render every figure even when its data and style are unchanged')
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='Record per-stage time and memory to PATH (*.json: Chrome trace, '
+                             'otherwise JSON lines)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also trace allocations per stage (slower)')
+
     args = parser.parse_args()
-    
+
+    if args.headless:
+        config.HEADLESS = True
+    if args.formats:
+        config.OUTPUT_FORMATS = args.formats
+    if args.no_figure_cache:
+        config.FIGURE_CACHE = False
+
     # If no specific analysis is chosen, run all
-    if not any([args.decade, args.yearly, args.weekday, args.seasonal]):
+    if not any(getattr(args, name) for name, *_ in ANALYSES):
         args.all = True
-    
+
+    if args.profile:
+        PROFILER.enable(trace_memory=args.profile_memory)
     run_selected_analyses(args)
+    if config.HEADLESS and config.FIGURE_CACHE:
+        from figure_cache import manifest_summary
+
+        summary = manifest_summary()
+        if summary['figures']:
+            print(f"\nFigure cache: {summary['hits']} hits, {summary['misses']} renders, "
+                  f"{summary['seconds_saved']:.1f}s of rendering saved (all runs)")
+    if args.profile:
+        PROFILER.write(args.profile)
+        print(PROFILER.summary())
 
 if __name__ == "__main__":
     main()
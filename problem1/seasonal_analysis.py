@@ -2,49 +2,64 @@
 Analysis of seasonal birth patterns throughout the year
 """
 import pandas as pd
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+from aggregates import BirthAggregates
+from calendar_index import calendar_index, month_day_labels
+from config import MONTH_NAMES, PLOT_STYLE, SEASONAL_COLORS
+from data_loader import ensure_feature_frame
+from plotting import cached_figure
+
 def seasonal_birth_analysis(data):
     """Examine seasonal patterns in births throughout the year"""
     
-    # Work with clean data
-    clean_data = data.dropna(subset=['day']).copy()
-    clean_data['day'] = clean_data['day'].astype(int)
-    
-    # Get average births for each date (month-day combo)
-    daily_averages = clean_data.groupby(['month', 'day'])['births'].mean().reset_index()
-    daily_averages['date_label'] = (daily_averages['month'].astype(str).str.zfill(2) + '-' + 
-                                   daily_averages['day'].astype(str).str.zfill(2))
+    if isinstance(data, BirthAggregates):
+        # Means come from the streamed sums and counts
+        daily_averages = data.means('month_day').rename('births').reset_index()
+        month_table = data.tables['month_day'].groupby(level='month').sum()
+        monthly_data = (month_table['births'] / month_table['count']).rename('births')
+    else:
+        # Work with rows that have a real calendar date
+        data = ensure_feature_frame(data, ('valid_date',))
+        clean_data = data.loc[data['valid_date'], ['month', 'day', 'births']]
+        
+        # Get average births for each date (month-day combo)
+        daily_averages = clean_data.groupby(['month', 'day'])['births'].mean().reset_index()
+        monthly_data = clean_data.groupby('month')['births'].mean()
     
-    # Use 2000 as a dummy year for plotting
-    daily_averages['plotting_date'] = pd.to_datetime('2000-' + daily_averages['date_label'], errors='coerce')
-    daily_averages = daily_averages.dropna(subset=['plotting_date']).sort_values('plotting_date')
+    month = daily_averages['month'].to_numpy()
+    day = daily_averages['day'].to_numpy()
+    daily_averages['date_label'] = month_day_labels(month, day)
     
-    # Create the time series plot
-    plt.figure(figsize=(14, 7))
-    plt.plot(daily_averages['plotting_date'], daily_averages['births'], linewidth=1.2, color='navy')
+    # Use 2000 (a leap year) as a dummy year for plotting
+    leap_year = calendar_index(2000, 2000)
+    daily_averages['plotting_date'] = leap_year.date[leap_year.slots(2000, month, day)]
     
-    # Overlay monthly averages 
-    monthly_data = clean_data.groupby('month')['births'].mean()
+    # Monthly averages for the overlay
     month_midpoints = pd.to_datetime([f'2000-{m:02d}-15' for m in range(1, 13)])
-    plt.plot(month_midpoints, monthly_data.values, 'ro-', linewidth=2, markersize=5, 
-             label='Monthly averages', alpha=0.8)
-    
-    plt.title('Average Births Throughout the Year')
-    plt.xlabel('Month')
-    plt.ylabel('Average Daily Births')
-    plt.grid(True, alpha=0.3)
-    plt.legend()
     
-    # Format x-axis nicely
-    plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%b'))
-    plt.gca().xaxis.set_major_locator(mdates.MonthLocator())
-    plt.xticks(rotation=45)
+    # Create the time series plot (skipped when the saved one shows the same data)
+    def draw(fig, ax):
+        ax.plot(daily_averages['plotting_date'], daily_averages['births'], linewidth=1.2,
+                color=SEASONAL_COLORS['daily_line'])
+        
+        # Overlay monthly averages 
+        ax.plot(month_midpoints, monthly_data.values, 'o-', color=SEASONAL_COLORS['monthly_points'],
+                linewidth=PLOT_STYLE['line_width'], markersize=5, label='Monthly averages', alpha=0.8)
+        
+        ax.set_title('Average Births Throughout the Year')
+        ax.set_xlabel('Month')
+        ax.set_ylabel('Average Daily Births')
+        ax.grid(True, alpha=PLOT_STYLE['grid_alpha'])
+        ax.legend()
+        
+        # Format x-axis nicely
+        ax.xaxis.set_major_formatter(mdates.DateFormatter('%b'))
+        ax.xaxis.set_major_locator(mdates.MonthLocator())
+        ax.tick_params(axis='x', labelrotation=45)
     
-    plt.tight_layout()
-    plt.savefig('births_by_date_of_year.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    cached_figure('births_by_date_of_year', PLOT_STYLE['seasonal_figure_size'], draw,
+                  [daily_averages[['plotting_date', 'births']], monthly_data])
     
     # Find interesting dates
     peak_day = daily_averages.loc[daily_averages['births'].idxmax()]
@@ -57,8 +72,7 @@ def seasonal_birth_analysis(data):
     }
     
     # Calculate monthly breakdown
-    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    months = MONTH_NAMES
     
     monthly_breakdown = {}
     for i, (month_num, avg) in enumerate(monthly_data.items()):
@@ -1,64 +1,61 @@
 """
 Analysis of birth patterns by day of the week
 """
-import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.ticker import FuncFormatter
+
+from aggregates import BirthAggregates
+from config import PLOT_STYLE, WEEKDAY_COLORS, WEEKDAY_DECADES, WEEKDAY_ORDER
+from data_loader import ensure_feature_frame
+from plotting import cached_figure
 
 def weekday_birth_patterns(data):
     """Check if births vary by day of week for 1960s, 1970s, 1980s"""
     
-    # Need to create actual dates to get weekdays
-    clean_data = data.dropna(subset=['day']).copy()
-    clean_data['day'] = clean_data['day'].astype(int)
-    
-    # Build date strings and convert to datetime
-    clean_data['date_str'] = (clean_data['year'].astype(str) + '-' + 
-                             clean_data['month'].astype(str).str.zfill(2) + '-' + 
-                             clean_data['day'].astype(str).str.zfill(2))
-    
-    clean_data['actual_date'] = pd.to_datetime(clean_data['date_str'], errors='coerce')
-    clean_data = clean_data.dropna(subset=['actual_date'])
-    
-    clean_data['weekday'] = clean_data['actual_date'].dt.day_name()
-    clean_data['decade'] = (clean_data['year'] // 10) * 10
-    
     # Focus on three decades as requested
-    decades_to_check = [1960, 1970, 1980]
-    subset = clean_data[clean_data['decade'].isin(decades_to_check)]
-    
-    # Sum up births by weekday for each decade
-    weekday_summary = subset.groupby(['decade', 'weekday'])['births'].sum().reset_index()
-    
-    # Create comparison charts
-    fig, axes = plt.subplots(1, 3, figsize=(16, 5))
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    
-    for i, decade in enumerate(decades_to_check):
-        decade_data = weekday_summary[weekday_summary['decade'] == decade]
-        decade_data = decade_data.set_index('weekday').reindex(days)
-        
-        # Color weekends differently
-        bar_colors = ['lightblue' if day in ['Saturday', 'Sunday'] else 'salmon' for day in days]
-        axes[i].bar(range(len(days)), decade_data['births'], color=bar_colors)
-        axes[i].set_title(f'{decade}s')
-        axes[i].set_xlabel('Day')
-        axes[i].set_ylabel('Total Births')
-        axes[i].set_xticks(range(len(days)))
-        axes[i].set_xticklabels([day[:3] for day in days], rotation=45)
-        axes[i].grid(True, alpha=0.3)
+    decades_to_check = WEEKDAY_DECADES
+    if isinstance(data, BirthAggregates):
+        weekday_summary = data.sums('decade_weekday').reset_index()
+        weekday_summary = weekday_summary[weekday_summary['decade'].isin(decades_to_check)]
+        weekday_summary = weekday_summary.reset_index(drop=True)
+    else:
+        data = ensure_feature_frame(data)
+        in_decades = data['valid_date'] & data['decade'].isin(decades_to_check)
+        subset = data.loc[in_decades, ['decade', 'weekday', 'births']]
         
-        # Format numbers
-        axes[i].yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1e6:.1f}M'))
+        # Sum up births by weekday for each decade
+        weekday_summary = subset.groupby(['decade', 'weekday'])['births'].sum().reset_index()
+    weekday_summary['weekday'] = weekday_summary['weekday'].map(dict(enumerate(WEEKDAY_ORDER)))
+    
+    # Create comparison charts (skipped when the saved ones show the same data)
+    days = WEEKDAY_ORDER
+    figsize = PLOT_STYLE['weekday_figure_size']
+    def draw(fig, axes):
+        for i, decade in enumerate(decades_to_check):
+            decade_data = weekday_summary[weekday_summary['decade'] == decade]
+            decade_data = decade_data.set_index('weekday').reindex(days)
+            
+            # Color weekends differently
+            bar_colors = [WEEKDAY_COLORS['weekend'] if day in ['Saturday', 'Sunday']
+                          else WEEKDAY_COLORS['weekday'] for day in days]
+            axes[i].bar(range(len(days)), decade_data['births'], color=bar_colors)
+            axes[i].set_title(f'{decade}s')
+            axes[i].set_xlabel('Day')
+            axes[i].set_ylabel('Total Births')
+            axes[i].set_xticks(range(len(days)))
+            axes[i].set_xticklabels([day[:3] for day in days], rotation=45)
+            axes[i].grid(True, alpha=PLOT_STYLE['grid_alpha'])
+            
+            # Format numbers
+            axes[i].yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'{x/1e6:.1f}M'))
+            
+            # Store the numbers for analysis
+            decade_breakdown = {}
+            for day in days:
+                count = decade_data.loc[day, 'births'] if day in decade_data.index else 0
+                decade_breakdown[day] = count
         
-        # Store the numbers for analysis
-        decade_breakdown = {}
-        for day in days:
-            count = decade_data.loc[day, 'births'] if day in decade_data.index else 0
-            decade_breakdown[day] = count
+        fig.suptitle('Birth Patterns by Day of Week')
     
-    plt.suptitle('Birth Patterns by Day of Week')
-    plt.tight_layout()
-    plt.savefig('births_by_weekday.png', dpi=150, bbox_inches='tight')
-    plt.show()
+    cached_figure('births_by_weekday', figsize, draw, [weekday_summary], 1, len(decades_to_check))
     
     return weekday_summary
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""
+Bootstrap confidence intervals and paired comparisons from stored test scores
+
+A resample is a column of multinomial counts (how often each test row was
+drawn), and every model is evaluated on the same counts, so the
+differences between models are paired. AUROC under counts is the weighted
+Mann-Whitney statistic: with each model's ranks computed once, the drawn
+negatives below every positive come from one sparse product of the
+counts (shared by all models) and a short cumulative sum per model, so a
+block of resamples is a few array operations rather than one
+roc_auc_score call per resample. Blocks get independent seeds from one
+SeedSequence and can run in a process pool; the result does not depend on
+the number of workers.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+from scipy import sparse
+
+def resample_counts(n_rows, n_resamples, rng):
+    """(n_rows, n_resamples) float32 array of how often each row is drawn
+
+    One column per resample, so a model's rows are gathered as contiguous
+    rows. Counts are integers, exact in float32.
+    """
+    draws = rng.integers(0, n_rows, size=(n_resamples, n_rows))
+    draws *= n_resamples
+    draws += np.arange(n_resamples)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=n_resamples * n_rows)
+    return counts.reshape(n_rows, n_resamples).astype(np.float32)
+
+def rank_positions(y_true, scores):
+    """Positive rows, negative rows by ascending score, and where each positive ranks
+
+    For every positive, below and upto count the negatives scoring strictly
+    lower and lower-or-equal, so negatives tied with it fall in between.
+    """
+    positives = np.flatnonzero(y_true == 1)
+    negatives = np.flatnonzero(y_true != 1)
+    negatives = negatives[np.argsort(scores[negatives], kind='mergesort')]
+    negative_scores = scores[negatives]
+    below = np.searchsorted(negative_scores, scores[positives], side='left')
+    upto = np.searchsorted(negative_scores, scores[positives], side='right')
+    return positives, negatives, below, upto
+
+def rank_segments(y_true, scores):
+    """Everything weighted_aurocs needs to evaluate every model
+
+    scores maps model names to test scores. Each model's negatives, in
+    score order, are cut into segments at the positives' ranks. One sparse
+    matrix maps count rows to the segment sums of all models, so a block of
+    resamples needs one sparse product. A positive's drawn negatives below
+    (or up to) it are then a cumulative sum over a few hundred segment sums
+    instead of over every negative row.
+    """
+    y_true = np.asarray(y_true)
+    rows, columns, models = [], [], {}
+    n_segments = 0
+    for model_name, model_scores in scores.items():
+        positives, negatives, below, upto = rank_positions(y_true, np.asarray(model_scores, dtype=float))
+        bounds = np.unique(np.concatenate([below, upto]))
+        rows.append(n_segments + np.searchsorted(bounds, np.arange(len(negatives)), side='right'))
+        columns.append(negatives)
+        models[model_name] = (n_segments, len(bounds) + 1, np.searchsorted(bounds, below),
+                              np.searchsorted(bounds, upto))
+        n_segments += len(bounds) + 1
+    rows, columns = np.concatenate(rows), np.concatenate(columns)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                               shape=(n_segments, len(y_true)))
+    return {'matrix': matrix, 'positives': np.flatnonzero(y_true == 1), 'models': models}
+
+def weighted_aurocs(segments, counts):
+    """AUROC of every model for each column of counts, from rank_segments
+
+    A positive drawn c times wins c times over every drawn negative below
+    it and half as often over tied ones, as roc_auc_score counts ties.
+    With fewer than 2**23 rows every sum of counts is an integer below
+    2**24, so float32 is exact and the result is identical to a float64
+    computation. Resamples without both classes
+    give NaN.
+    """
+    segment_sums = segments['matrix'] @ counts
+    positive_counts = counts[segments['positives']]
+    drawn_positives = positive_counts.sum(axis=0, dtype=np.float64)
+    aurocs = {}
+    for model_name, (start, n_segments, below, upto) in segments['models'].items():
+        negatives_below = np.cumsum(segment_sums[start:start + n_segments], axis=0)
+        wins = np.einsum('ij,ij->j', positive_counts,
+                         negatives_below[below] + negatives_below[upto], dtype=np.float64) / 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            aurocs[model_name] = wins / (drawn_positives * negatives_below[-1].astype(np.float64))
+    return aurocs
+
+def _bootstrap_block(seed, n_resamples, n_rows, segments, correct):
+    counts = resample_counts(n_rows, n_resamples, np.random.default_rng(seed))
+    accuracy = (counts.T @ correct).astype(np.float64) / n_rows
+    aurocs = weighted_aurocs(segments, counts)
+    return {model_name: {'auroc': aurocs[model_name], 'accuracy': accuracy[:, i]}
+            for i, model_name in enumerate(aurocs)}
+
+def bootstrap_metrics(y_true, scores, correct, n_resamples=10000, seed=0, n_jobs=1,
+                      block_elements=2**22):
+    """Bootstrap distributions of test AUROC and accuracy for every model
+
+    scores and correct map model names to test scores and to whether each
+    test prediction was right. Returns {model: {'auroc': array,
+    'accuracy': array}} with n_resamples values each. Resamples are drawn
+    in blocks of about block_elements counts, n_jobs blocks at a time.
+    """
+    y_true = np.asarray(y_true)
+    segments = rank_segments(y_true, scores)
+    correct = np.column_stack([np.asarray(correct[model_name], dtype=np.float32)
+                               for model_name in segments['models']])
+
+    block_size = max(1, block_elements // len(y_true))
+    sizes = [min(block_size, n_resamples - start) for start in range(0, n_resamples, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if n_jobs == 1 or len(sizes) == 1:
+        blocks = [_bootstrap_block(block_seed, size, len(y_true), segments, correct)
+                  for block_seed, size in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(sizes))) as pool:
+            blocks = list(pool.map(_bootstrap_block, seeds, sizes, [len(y_true)] * len(sizes),
+                                   [segments] * len(sizes), [correct] * len(sizes)))
+    return {model_name: {metric: np.concatenate([block[model_name][metric] for block in blocks])
+                         for metric in ('auroc', 'accuracy')}
+            for model_name in segments['models']}
+
+def percentile_interval(samples, level=0.95):
+    """Percentile bootstrap interval [low, high], ignoring NaN resamples"""
+    tail = (1 - level) / 2 * 100
+    return np.nanpercentile(samples, [tail, 100 - tail]).tolist()
+
+def paired_comparison(samples_a, samples_b, level=0.95):
+    """Bootstrap interval and two-sided p-value for the difference a - b"""
+    difference = samples_a - samples_b
+    difference = difference[~np.isnan(difference)]
+    p_value = 2 * min(np.mean(difference <= 0), np.mean(difference >= 0))
+    return {
+        'difference_ci': percentile_interval(difference, level),
+        'p_value': float(min(1.0, p_value))
+    }
+
+def compare_models(samples, metric='auroc', level=0.95):
+    """Paired comparison of every pair of models on one metric"""
+    return {(a, b): paired_comparison(samples[a][metric], samples[b][metric], level)
+            for a, b in combinations(samples, 2)}
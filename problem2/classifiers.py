@@ -1,20 +1,233 @@
 """
 Classification models for ICU mortality prediction
 """
+import copy
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
-from sklearn.linear_model import LogisticRegression
+from threadpoolctl import threadpool_limits
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
+from bootstrap import bootstrap_metrics, compare_models, paired_comparison, percentile_interval
+from compact import CompactPreprocessor
+from kernels import compile_model
+from metrics import auroc_from_curve, evaluate_scores, ranking_curve
+from search import halving_budgets, successive_halving
+from training_cache import array_digest
+
+# Default hyperparameter grids; ICUClassifiers accepts replacements
+RF_PARAM_GRID = [
+    {'max_depth': 3, 'n_estimators': 100},
+    {'max_depth': 3, 'n_estimators': 500},
+    {'max_depth': 5, 'n_estimators': 100},
+    {'max_depth': 5, 'n_estimators': 500}
+]
+SVM_PARAM_GRID = [
+    {'C': 0.1, 'kernel': 'linear'},
+    {'C': 0.1, 'kernel': 'rbf'},
+    {'C': 1.0, 'kernel': 'linear'},
+    {'C': 1.0, 'kernel': 'rbf'},
+    {'C': 10.0, 'kernel': 'linear'},
+    {'C': 10.0, 'kernel': 'rbf'}
+]
+
+# Smallest training subset an SVM is scored on during successive halving
+MIN_HALVING_ROWS = 200
+
+# SVM rankings on small subsets are noisy (a linear SVM that wins on all
+# rows can rank third at a third of them), so SVM halving scores every
+# candidate on half the rows and keeps the top half, whatever halving_factor
+SVM_HALVING_FACTOR = 2
+
+LR_PARAMS = {'random_state': 42, 'max_iter': 1000}
+
+# Training arrays for sweep workers, set once per process by _init_sweep_worker
+_sweep_data = None
+
+def _init_sweep_worker(X_train, y_train, X_test, y_test):
+    """Receive the data once per worker and keep BLAS to one thread"""
+    global _sweep_data
+    threadpool_limits(1)
+    _sweep_data = (X_train, y_train, X_test, y_test)
+
+def score_split(model, X):
+    """One inference pass: positive-class scores, predicted labels, probabilities
+    
+    Probability models are scored with predict_proba and the label is its
+    argmax, which is what their predict() returns. SVMs fitted without
+    probability=True use decision_function (same ranking, sign gives the
+    label) and have no probabilities. SVMs with probability=True are the
+    exception: their Platt probabilities come from an internal
+    cross-validation and can disagree with the sign of the decision
+    function, which is what predict() uses, so the label still comes from
+    the decision function.
+    """
+    if isinstance(model, SVC):
+        scores = model.decision_function(X)
+        predictions = model.classes_[(scores > 0).astype(int)]
+        if model.probability is not True:
+            return scores, predictions, None
+        proba = model.predict_proba(X)[:, 1]
+        return proba, predictions, proba
+    proba = model.predict_proba(X)
+    return proba[:, 1], model.classes_[np.argmax(proba, axis=1)], proba[:, 1]
+
+def evaluate_model(model, X_train, y_train, X_test, y_test, extended=False, chunk_rows=None):
+    """Metrics for both splits from one scoring pass each
+    
+    Returns the results dict (train_/test_ prefixed metrics), the test
+    scores and the test predictions; the last two are kept for later
+    comparisons between models. With chunk_rows the splits are scored a
+    chunk at a time.
+    """
+    split_metrics = {}
+    for split, X, y in (('train', X_train, y_train), ('test', X_test, y_test)):
+        if chunk_rows is None:
+            scores, predictions, probabilities = score_split(model, X)
+        else:
+            scores, predictions, probabilities = score_in_chunks(model, X, chunk_rows)
+        split_metrics[split] = evaluate_scores(y, scores, predictions, probabilities, extended)
+        if split == 'test':
+            test_scores, test_predictions = scores, predictions
+    
+    results = {}
+    for metric in split_metrics['train']:
+        for split in ('train', 'test'):
+            results[f'{split}_{metric}'] = split_metrics[split][metric]
+    return results, test_scores, test_predictions
+
+def iter_chunks(n_rows, chunk_rows, rng=None):
+    """Row slices covering n_rows, in shuffled order when an rng is given"""
+    starts = np.arange(0, n_rows, chunk_rows)
+    if rng is not None:
+        starts = rng.permutation(starts)
+    for start in starts:
+        yield slice(start, min(start + chunk_rows, n_rows))
+
+def score_in_chunks(model, X, chunk_rows):
+    """score_split over row chunks, so only one chunk of X is in memory"""
+    parts = [score_split(model, np.asarray(X[rows])) for rows in iter_chunks(len(X), chunk_rows)]
+    return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+
+def _fit_config(estimator_class, estimator_params, X_train, y_train, X_test, y_test,
+                extended=False):
+    """Fit one configuration and compute its train/test metrics"""
+    model = estimator_class(**estimator_params)
+    model.fit(X_train, y_train)
+    results, test_scores, test_predictions = evaluate_model(model, X_train, y_train,
+                                                            X_test, y_test, extended)
+    return model, results, test_scores, test_predictions
+
+def _fit_config_in_worker(estimator_class, estimator_params, extended):
+    return _fit_config(estimator_class, estimator_params, *_sweep_data, extended=extended)
+
+def _write_folds(fold_dir, X, y, n_folds):
+    """Save each fold's raw and standardized arrays as .npy files for memory mapping
+    
+    The scaler is fitted once per fold, on that fold's training rows only.
+    """
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42).split(X, y)
+    for fold, (fit_rows, val_rows) in enumerate(folds):
+        X_fit, X_val = np.asarray(X[fit_rows]), np.asarray(X[val_rows])
+        scaler = StandardScaler().fit(X_fit)
+        arrays = {'X_fit': X_fit, 'X_val': X_val, 'y_fit': y[fit_rows], 'y_val': y[val_rows],
+                  'X_fit_scaled': scaler.transform(X_fit), 'X_val_scaled': scaler.transform(X_val)}
+        for name, array in arrays.items():
+            np.save(os.path.join(fold_dir, f'fold{fold}_{name}.npy'), array)
+
+def _fit_fold(fold_dir, fold, estimator_class, estimator_params, scaled):
+    """Validation AUROC of one configuration on one fold, reading memory-mapped arrays"""
+    def load(name):
+        return np.load(os.path.join(fold_dir, f'fold{fold}_{name}.npy'), mmap_mode='r')
+    suffix = '_scaled' if scaled else ''
+    model = estimator_class(**estimator_params).fit(load('X_fit' + suffix), load('y_fit'))
+    scores, _, _ = score_split(model, load('X_val' + suffix))
+    return auroc_from_curve(*ranking_curve(np.asarray(load('y_val')), np.asarray(scores, dtype=float)))
+
+def _oob_auroc(forest, y):
+    """AUROC of a forest's out-of-bag probabilities over the rows that have one"""
+    oob_scores = forest.oob_decision_function_[:, 1]
+    has_oob = np.isfinite(oob_scores)
+    return auroc_from_curve(*ranking_curve(np.asarray(y)[has_oob], oob_scores[has_oob]))
+
+def _fit_cost(estimator_class, estimator_params, n_rows):
+    """Rough single-core seconds to fit a configuration, used only to order jobs"""
+    if estimator_class is RandomForestClassifier:
+        return 6e-6 * estimator_params.get('n_estimators', 100) * n_rows
+    if estimator_class is SVC:
+        # Linear SVMs converge more slowly as C grows
+        linear = estimator_params.get('kernel') == 'linear'
+        return 4e-8 * n_rows ** 2 * (1 + 5 * estimator_params.get('C', 1.0) if linear else 1)
+    return 4e-4 * n_rows
+
+def _extra_params(params, named):
+    return ''.join(f'_{key}{value}' for key, value in params.items() if key not in named)
+
+def _rf_name(params):
+    return (f"random_forest_depth{params['max_depth']}_est{params['n_estimators']}"
+            + _extra_params(params, ('max_depth', 'n_estimators')))
+
+def _svm_name(params):
+    return f"svm_C{params['C']}_kernel{params['kernel']}" + _extra_params(params, ('C', 'kernel'))
+
 class ICUClassifiers:
     """Container for different classification models"""
     
-    def __init__(self):
+    def __init__(self, n_jobs=1, max_cores=None, svm_calibration='best', extended_metrics=False,
+                 rf_grid=None, svm_grid=None, search='grid', halving_factor=3, cache=None):
+        """Sweep settings; every argument is optional
+        
+        n_jobs: configurations fitted at once in separate processes (-1 for
+            one per core); max_cores caps the cores a sweep may use.
+        svm_calibration: 'best' scores SVMs by decision_function and fits
+            Platt scaling for the best one only; 'all' fits every SVM with
+            probability=True.
+        extended_metrics: add PR-AUC, Brier score and calibration bins.
+        rf_grid, svm_grid: lists of parameter dicts replacing the defaults.
+        search: 'grid' fits every configuration; 'halving' runs successive
+            halving (forests on tree count, SVMs on training rows), which
+            may not pick the grid's best model when candidates score
+            closely. Candidates are pruned on out-of-bag (forests) or
+            held-out training rows (SVMs), never on the test set. Pruned
+            configurations get no results entry, and search_history keeps
+            every (budget, AUROC) evaluation. n_jobs only applies to the
+            grid.
+        halving_factor: forest halving keeps the top 1/halving_factor of
+            the candidates after each rung. It does not apply to SVMs,
+            which always halve with SVM_HALVING_FACTOR (2).
+        cache: optional TrainingCache; fits already stored are loaded
+            instead of refitted.
+
+        Once cross_validate() has run, the SVM to calibrate and
+        get_best_models() are chosen by mean CV AUROC instead of test AUROC.
+        """
         self.models = {}
         self.results = {}
+        self.test_scores = {}
+        self.test_predictions = {}
+        self.comparisons = {}
+        self.cv_results = {}
+        self.search_history = {}
         self.scaler = StandardScaler()
+        self.compact = False
+        self.n_jobs = n_jobs
+        self.max_cores = max_cores
+        self.svm_calibration = svm_calibration
+        self.extended_metrics = extended_metrics
+        self.rf_grid = rf_grid or RF_PARAM_GRID
+        self.svm_grid = svm_grid or SVM_PARAM_GRID
+        self.search = search
+        self.halving_factor = halving_factor
+        self.cache = cache
+        self._digests = []
     
     def prepare_data(self, X_train, y_train, X_test, y_test):
         """Standardize features for SVM"""
@@ -22,145 +235,420 @@ class ICUClassifiers:
         X_test_scaled = self.scaler.transform(X_test)
         return X_train_scaled, X_test_scaled
     
+    def prepare_compact(self, X_train, X_test, missing_indicators=False):
+        """One float32 matrix per split, imputed and standardized, for every model
+        
+        Replaces prepare_data: the returned arrays take the place of both
+        the raw and the scaled features, and self.scaler becomes the fitted
+        CompactPreprocessor so saved models are scored through it.
+        """
+        self.scaler = CompactPreprocessor(missing_indicators)
+        self.compact = True
+        return self.scaler.fit_transform(X_train), self.scaler.transform(X_test)
+    
+    def _sweep_workers(self, n_configs):
+        workers = os.cpu_count() if self.n_jobs == -1 else self.n_jobs
+        if self.max_cores:
+            workers = min(workers, self.max_cores)
+        return max(1, min(workers, n_configs))
+    
+    def _data_digest(self, *arrays):
+        """Content hash of arrays, remembered for the arrays objects already hashed"""
+        for seen, digest in self._digests:
+            if len(seen) == len(arrays) and all(a is b for a, b in zip(seen, arrays)):
+                return digest
+        digest = array_digest(*arrays)
+        self._digests.append((arrays, digest))
+        return digest
+    
+    def _cache_key(self, estimator_class, estimator_params, *arrays):
+        return self.cache.key(estimator_class, estimator_params, self._data_digest(*arrays),
+                              extended=self.extended_metrics)
+    
+    def _fit(self, estimator_class, estimator_params, X_train, y_train, X_test, y_test):
+        """_fit_config in this process, through the cache when there is one"""
+        fit = lambda: _fit_config(estimator_class, estimator_params, X_train, y_train,
+                                  X_test, y_test, self.extended_metrics)
+        if self.cache is None:
+            return fit()
+        key = self._cache_key(estimator_class, estimator_params, X_train, y_train, X_test, y_test)
+        return self.cache.cached(key, fit)
+    
+    def run_sweep(self, configs, X_train, y_train, X_test, y_test):
+        """Fit a list of configurations, in a process pool when n_jobs > 1
+        
+        Each configuration is (model_name, estimator_class, estimator_params,
+        grid_params). Every estimator gets a fixed random_state, so results
+        do not depend on scheduling; they are stored in grid order. With a
+        cache, only the configurations missing from it are fitted.
+        """
+        fitted = [None] * len(configs)
+        keys = [None] * len(configs)
+        if self.cache is not None:
+            for i, (_, estimator_class, estimator_params, _) in enumerate(configs):
+                keys[i] = self._cache_key(estimator_class, estimator_params,
+                                          X_train, y_train, X_test, y_test)
+                fitted[i] = self.cache.get(keys[i])
+        pending = [i for i, result in enumerate(fitted) if result is None]
+        
+        workers = self._sweep_workers(len(pending))
+        extended = self.extended_metrics
+        if workers == 1:
+            for i in pending:
+                _, estimator_class, estimator_params, _ = configs[i]
+                fitted[i] = _fit_config(estimator_class, estimator_params,
+                                        X_train, y_train, X_test, y_test, extended)
+        elif pending:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                     initargs=(X_train, y_train, X_test, y_test)) as pool:
+                futures = {i: pool.submit(_fit_config_in_worker, configs[i][1], configs[i][2],
+                                          extended)
+                           for i in pending}
+                for i, future in futures.items():
+                    fitted[i] = future.result()
+        if self.cache is not None:
+            for i in pending:
+                self.cache.put(keys[i], fitted[i])
+        
+        sweep_results = {}
+        for (model_name, _, _, grid_params), (model, metrics, *test_outputs) in zip(configs, fitted):
+            results = dict({'params': grid_params}, **metrics)
+            sweep_results[model_name] = self._record(model_name, model, results, *test_outputs)
+        return sweep_results
+    
+    def _record(self, model_name, model, results, test_scores, test_predictions):
+        """Store a fitted model with its results, adding its CV scores if there are any"""
+        self.models[model_name] = model
+        self.test_scores[model_name] = test_scores
+        self.test_predictions[model_name] = test_predictions
+        if model_name in self.cv_results:
+            results.update((key, value) for key, value in self.cv_results[model_name].items()
+                           if key != 'params')
+        self.results[model_name] = results
+        return results
+    
     def train_logistic_regression(self, X_train, y_train, X_test, y_test):
         """Train Logistic Regression with default parameters"""
         
         # Use default parameters as specified
-        model = LogisticRegression(random_state=42, max_iter=1000)
-        model.fit(X_train, y_train)
-        
-        # Predictions
-        train_pred = model.predict(X_train)
-        test_pred = model.predict(X_test)
-        train_pred_proba = model.predict_proba(X_train)[:, 1]
-        test_pred_proba = model.predict_proba(X_test)[:, 1]
-        
-        # Metrics
-        results = {
-            'train_accuracy': accuracy_score(y_train, train_pred),
-            'test_accuracy': accuracy_score(y_test, test_pred),
-            'train_auroc': roc_auc_score(y_train, train_pred_proba),
-            'test_auroc': roc_auc_score(y_test, test_pred_proba)
-        }
-        
-        self.models['logistic_regression'] = model
-        self.results['logistic_regression'] = results
-        return results
+        model, results, *test_outputs = self._fit(LogisticRegression, LR_PARAMS,
+                                                  X_train, y_train, X_test, y_test)
+        return self._record('logistic_regression', model, results, *test_outputs)
+    
+    def train_incremental_logistic(self, X_train, y_train, X_test, y_test, chunk_rows=100_000,
+                                   n_epochs=5, update=False):
+        """Logistic regression fitted by SGD one chunk of rows at a time
+        
+        X_train and X_test may be memory-mapped (see data_loader.ICUDataset):
+        a StandardScaler is fitted with partial_fit over the chunks, then
+        averaged SGDClassifier(loss='log_loss') makes n_epochs passes over them in
+        shuffled chunk order, so memory stays bounded by chunk_rows. With
+        update=True the existing model and scaler continue from their state,
+        which is how new admissions are folded in without a refit.
+        
+        The model is stored as a scaler + SGD pipeline under
+        'incremental_logistic_regression'.
+        """
+        model_name = 'incremental_logistic_regression'
+        if update and model_name in self.models:
+            scaler, sgd = (step for _, step in self.models[model_name].steps)
+        else:
+            scaler = StandardScaler()
+            sgd = SGDClassifier(loss='log_loss', average=True, random_state=42)
+        
+        for rows in iter_chunks(len(X_train), chunk_rows):
+            scaler.partial_fit(np.asarray(X_train[rows]))
+        
+        classes = np.array([0, 1])
+        rng = np.random.default_rng(42)
+        for _ in range(n_epochs):
+            for rows in iter_chunks(len(X_train), chunk_rows, rng):
+                X_chunk = scaler.transform(np.asarray(X_train[rows]))
+                y_chunk = np.asarray(y_train[rows])
+                order = rng.permutation(len(y_chunk))
+                sgd.partial_fit(X_chunk[order], y_chunk[order], classes=classes)
+        
+        model = Pipeline([('scaler', scaler), ('sgd', sgd)])
+        results, test_scores, test_predictions = evaluate_model(
+            model, X_train, y_train, X_test, y_test, self.extended_metrics, chunk_rows)
+        
+        return self._record(model_name, model, results, test_scores, test_predictions)
     
     def train_random_forest(self, X_train, y_train, X_test, y_test):
         """Train Random Forest with different parameter combinations"""
         
-        # Parameter combinations as specified
-        param_combinations = [
-            {'max_depth': 3, 'n_estimators': 100},
-            {'max_depth': 3, 'n_estimators': 500},
-            {'max_depth': 5, 'n_estimators': 100},
-            {'max_depth': 5, 'n_estimators': 500}
-        ]
-        
-        rf_results = {}
-        
-        for i, params in enumerate(param_combinations):
-            model_name = f"random_forest_depth{params['max_depth']}_est{params['n_estimators']}"
-            
-            model = RandomForestClassifier(
-                max_depth=params['max_depth'],
-                n_estimators=params['n_estimators'],
-                random_state=42
-            )
-            model.fit(X_train, y_train)
-            
-            # Predictions
-            train_pred = model.predict(X_train)
-            test_pred = model.predict(X_test)
-            train_pred_proba = model.predict_proba(X_train)[:, 1]
-            test_pred_proba = model.predict_proba(X_test)[:, 1]
-            
-            # Metrics
-            results = {
-                'params': params,
-                'train_accuracy': accuracy_score(y_train, train_pred),
-                'test_accuracy': accuracy_score(y_test, test_pred),
-                'train_auroc': roc_auc_score(y_train, train_pred_proba),
-                'test_auroc': roc_auc_score(y_test, test_pred_proba)
-            }
-            
-            self.models[model_name] = model
-            rf_results[model_name] = results
-        
-        self.results.update(rf_results)
-        return rf_results
+        if self.search == 'halving':
+            return self._halving_random_forest(X_train, y_train, X_test, y_test)
+        
+        configs = []
+        for params in self.rf_grid:
+            configs.append((_rf_name(params), RandomForestClassifier, dict(params, random_state=42), params))
+        
+        return self.run_sweep(configs, X_train, y_train, X_test, y_test)
     
     def train_svm(self, X_train_scaled, y_train, X_test_scaled, y_test):
         """Train SVM with different parameter combinations"""
         
-        # Parameter combinations for C and kernel
-        param_combinations = [
-            {'C': 0.1, 'kernel': 'linear'},
-            {'C': 0.1, 'kernel': 'rbf'},
-            {'C': 1.0, 'kernel': 'linear'}, 
-            {'C': 1.0, 'kernel': 'rbf'},
-            {'C': 10.0, 'kernel': 'linear'},
-            {'C': 10.0, 'kernel': 'rbf'}
-        ]
-        
-        svm_results = {}
-        
-        for i, params in enumerate(param_combinations):
-            model_name = f"svm_C{params['C']}_kernel{params['kernel']}"
-            
-            model = SVC(
-                C=params['C'],
-                kernel=params['kernel'],
-                probability=True,  # Enable probability estimates for AUROC
-                random_state=42
-            )
-            model.fit(X_train_scaled, y_train)
-            
-            # Predictions
-            train_pred = model.predict(X_train_scaled)
-            test_pred = model.predict(X_test_scaled)
-            train_pred_proba = model.predict_proba(X_train_scaled)[:, 1]
-            test_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-            
-            # Metrics
-            results = {
-                'params': params,
-                'train_accuracy': accuracy_score(y_train, train_pred),
-                'test_accuracy': accuracy_score(y_test, test_pred),
-                'train_auroc': roc_auc_score(y_train, train_pred_proba),
-                'test_auroc': roc_auc_score(y_test, test_pred_proba)
-            }
-            
-            self.models[model_name] = model
-            svm_results[model_name] = results
-        
-        self.results.update(svm_results)
+        if self.search == 'halving':
+            svm_results = self._halving_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+        else:
+            configs = []
+            for params in self.svm_grid:
+                configs.append((_svm_name(params), SVC, self._svm_params(params), params))
+            svm_results = self.run_sweep(configs, X_train_scaled, y_train, X_test_scaled, y_test)
+        
+        if self.svm_calibration == 'best':
+            best_name = max(svm_results, key=self._selection_score)
+            self.models[best_name] = self.calibrate_svm(self.models[best_name],
+                                                        X_train_scaled, y_train)
         return svm_results
     
+    def _svm_params(self, params):
+        # AUROC only needs a ranking, so Platt scaling is optional. probability
+        # is only passed when wanted: scikit-learn 1.9 deprecates it and warns
+        # whenever it is set, even to False
+        if self.svm_calibration == 'all':
+            params = dict(params, probability=True)
+        return dict(params, random_state=42)
+    
+    def _store_sweep(self, grid, name_for, fitted):
+        """Record fitted (model, metrics, test_scores, test_predictions) by model name, in grid order"""
+        sweep_results = {}
+        for params in grid:
+            model_name = name_for(params)
+            if model_name not in fitted:
+                continue
+            model, metrics, *test_outputs = fitted[model_name]
+            results = dict({'params': params}, **metrics)
+            sweep_results[model_name] = self._record(model_name, model, results, *test_outputs)
+        return sweep_results
+    
+    def _halving_random_forest(self, X_train, y_train, X_test, y_test):
+        """Successive halving over tree count with warm-started forests
+        
+        Each setting of the non-tree parameters is one candidate. It is fitted
+        at the smallest tree count of the grid and grown with warm_start
+        (identical trees to a fresh fit with the same random_state) only
+        while it stays in the top 1/halving_factor, and at least the top two
+        always go on. Candidates are ranked by out-of-bag AUROC, so the test
+        set is only used for reporting.
+        """
+        candidates = []
+        for params in self.rf_grid:
+            candidate = tuple((key, value) for key, value in params.items() if key != 'n_estimators')
+            if candidate not in candidates:
+                candidates.append(candidate)
+        tree_counts = sorted({params['n_estimators'] for params in self.rf_grid})
+        if len(tree_counts) == 1:
+            tree_counts = halving_budgets(tree_counts[0], len(candidates), self.halving_factor,
+                                          min_budget=10)
+        
+        forests = {}
+        fitted = {}
+        def score(candidate, n_estimators):
+            if candidate in forests:
+                # Grow a copy so the smaller forest stays intact as its own model
+                forest = copy.deepcopy(forests[candidate])
+                forest.set_params(n_estimators=n_estimators, warm_start=True)
+            else:
+                forest = RandomForestClassifier(**dict(candidate), n_estimators=n_estimators,
+                                                random_state=42, warm_start=True)
+            forest.set_params(oob_score=True)
+            forest.fit(X_train, y_train)
+            oob_auroc = _oob_auroc(forest, y_train)
+            # Leave the same model (and parameters) a grid fit would produce
+            forest.set_params(warm_start=False, oob_score=False)
+            del forest.oob_score_, forest.oob_decision_function_
+            forests[candidate] = forest
+            results, *test_outputs = evaluate_model(forest, X_train, y_train, X_test, y_test,
+                                                    self.extended_metrics)
+            fitted[_rf_name(dict(candidate, n_estimators=n_estimators))] = (forest, results,
+                                                                            *test_outputs)
+            return oob_auroc
+        
+        _, history = successive_halving(candidates, tree_counts, score, self.halving_factor,
+                                        min_survivors=2)
+        for candidate, evaluations in history.items():
+            self.search_history[_rf_name(dict(candidate, n_estimators=tree_counts[-1]))] = evaluations
+        return self._store_sweep(self.rf_grid, _rf_name, fitted)
+    
+    def _halving_svm(self, X_train_scaled, y_train, X_test_scaled, y_test):
+        """Successive halving over the number of training rows
+        
+        Candidates are fitted on a random half of the training set and
+        scored by AUROC on the other half; only the top half are fitted on
+        all rows,
+        giving the same models the full grid would have produced for them.
+        The pick usually matches the grid's, but a candidate that ranks
+        poorly on half the rows and best on all of them is pruned, so
+        halving can choose a different (close-scoring) SVM.
+        """
+        params_by_name = {_svm_name(params): params for params in self.svm_grid}
+        n_rows = len(y_train)
+        min_budget = max(min(n_rows, MIN_HALVING_ROWS), n_rows // SVM_HALVING_FACTOR)
+        budgets = halving_budgets(n_rows, len(params_by_name), SVM_HALVING_FACTOR,
+                                  min_budget=min_budget)
+        order = np.random.default_rng(42).permutation(n_rows)
+        
+        fitted = {}
+        subsets = {}
+        def score(model_name, budget):
+            params = self._svm_params(params_by_name[model_name])
+            if budget == n_rows:
+                # Nothing is pruned after the last rung; its test AUROC is only reported
+                model, results, *test_outputs = self._fit(SVC, params, X_train_scaled, y_train,
+                                                          X_test_scaled, y_test)
+                fitted[model_name] = (model, results, *test_outputs)
+                return results['test_auroc']
+            if budget not in subsets:
+                # One split per rung, so the cache hashes it only once
+                rows, held_out = np.sort(order[:budget]), np.sort(order[budget:])
+                subsets[budget] = (X_train_scaled[rows], y_train[rows],
+                                   X_train_scaled[held_out], y_train[held_out])
+            X_fit, y_fit, X_val, y_val = subsets[budget]
+            model = self._fit(SVC, params, X_fit, y_fit, X_test_scaled, y_test)[0]
+            scores, _, _ = score_split(model, X_val)
+            return auroc_from_curve(*ranking_curve(np.asarray(y_val), np.asarray(scores, dtype=float)))
+        
+        _, history = successive_halving(list(params_by_name), budgets, score, SVM_HALVING_FACTOR)
+        self.search_history.update(history)
+        return self._store_sweep(self.svm_grid, _svm_name, fitted)
+    
+    def calibrate_svm(self, model, X_train_scaled, y_train):
+        """Fit Platt scaling for an SVM so it gains predict_proba
+        
+        Platt scaling as in libsvm: the SVM is refit on all the data and a
+        sigmoid is fit on 5-fold cross-validated decision values.
+        """
+        def fit():
+            calibrated = CalibratedClassifierCV(SVC(**model.get_params()), method='sigmoid',
+                                                cv=5, ensemble=False)
+            return calibrated.fit(X_train_scaled, y_train)
+        if self.cache is None:
+            return fit()
+        key = self._cache_key(CalibratedClassifierCV, dict(model.get_params(), method='sigmoid', cv=5),
+                              X_train_scaled, y_train)
+        return self.cache.cached(key, fit)
+    
+    def export_kernels(self):
+        """NumPy inference kernels for every model that has one
+        
+        Logistic regression and random forests compile to kernels.LinearKernel
+        and kernels.ForestKernel; SVMs are skipped. The kernels give the same
+        probabilities as predict_proba at a fraction of the per-call cost.
+        """
+        kernels = {}
+        for model_name, model in self.models.items():
+            kernel = compile_model(model)
+            if kernel is not None:
+                kernels[model_name] = kernel
+        return kernels
+    
+    def bootstrap_intervals(self, y_test, n_resamples=10000, level=0.95, seed=0):
+        """Bootstrap intervals for every model from its stored test scores
+        
+        Adds test_auroc_ci and test_accuracy_ci to each results dict, and
+        auroc_vs_best: the paired difference in test AUROC to the model
+        with the highest one, with its interval and p-value. All pairwise
+        AUROC comparisons are kept in self.comparisons. No model is
+        scored again; accuracy uses the stored test predictions.
+        """
+        y_test = np.asarray(y_test)
+        correct = {model_name: predictions == y_test
+                   for model_name, predictions in self.test_predictions.items()}
+        samples = bootstrap_metrics(y_test, self.test_scores, correct, n_resamples, seed,
+                                    n_jobs=self._sweep_workers(n_resamples))
+        
+        best_name = max(samples, key=lambda name: self.results[name]['test_auroc'])
+        for model_name, model_samples in samples.items():
+            results = self.results[model_name]
+            results['test_auroc_ci'] = percentile_interval(model_samples['auroc'], level)
+            results['test_accuracy_ci'] = percentile_interval(model_samples['accuracy'], level)
+            results['auroc_vs_best'] = dict(
+                paired_comparison(model_samples['auroc'], samples[best_name]['auroc'], level),
+                model=best_name,
+                difference=results['test_auroc'] - self.results[best_name]['test_auroc'])
+        
+        self.comparisons = compare_models(samples, 'auroc', level)
+        return self.comparisons
+    
+    def cross_validate(self, X_train, y_train, n_folds=5):
+        """Mean validation AUROC of every configuration over stratified k folds
+        
+        Each fold's arrays, raw and standardized by a scaler fitted on that
+        fold's training rows, are written once to .npy files that all jobs
+        memory-map. The (fold, configuration) jobs run in a process pool
+        under the same n_jobs/max_cores limits as the sweeps, submitted
+        most expensive first so a long fit does not start last.
+        """
+        configs = [('logistic_regression', LogisticRegression, LR_PARAMS, None, False)]
+        configs += [(_rf_name(params), RandomForestClassifier, dict(params, random_state=42), params, False)
+                    for params in self.rf_grid]
+        configs += [(_svm_name(params), SVC, self._svm_params(params), params, True)
+                    for params in self.svm_grid]
+        n_fit_rows = len(y_train) * (n_folds - 1) // n_folds
+        jobs = sorted(((fold, config) for fold in range(n_folds) for config in configs),
+                      key=lambda job: _fit_cost(job[1][1], job[1][2], n_fit_rows), reverse=True)
+        
+        aurocs = {config[0]: [None] * n_folds for config in configs}
+        with tempfile.TemporaryDirectory(prefix='icu_cv_') as fold_dir:
+            _write_folds(fold_dir, X_train, np.asarray(y_train), n_folds)
+            workers = self._sweep_workers(len(jobs))
+            if workers == 1:
+                for fold, (model_name, estimator_class, estimator_params, _, scaled) in jobs:
+                    aurocs[model_name][fold] = _fit_fold(fold_dir, fold, estimator_class,
+                                                         estimator_params, scaled)
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=threadpool_limits,
+                                         initargs=(1,)) as pool:
+                    futures = {(fold, config[0]): pool.submit(_fit_fold, fold_dir, fold, config[1],
+                                                              config[2], config[4])
+                               for fold, config in jobs}
+                    for (fold, model_name), future in futures.items():
+                        aurocs[model_name][fold] = future.result()
+        
+        for model_name, _, _, params, _ in configs:
+            cv_results = {'cv_auroc': float(np.mean(aurocs[model_name])),
+                          'cv_auroc_std': float(np.std(aurocs[model_name])),
+                          'cv_auroc_folds': aurocs[model_name]}
+            if params is not None:
+                cv_results['params'] = params
+            self.cv_results[model_name] = cv_results
+            if model_name in self.results:
+                self.results[model_name].update((key, value) for key, value in cv_results.items()
+                                                if key != 'params')
+        return self.cv_results
+    
+    def _selection_score(self, model_name):
+        if model_name in self.cv_results:
+            return self.cv_results[model_name]['cv_auroc']
+        return self.results[model_name]['test_auroc']
+    
     def get_all_results(self):
         """Return all model results"""
         return self.results
     
     def get_best_models(self):
-        """Find best model for each algorithm type based on test AUROC"""
+        """Find best model for each algorithm type based on CV AUROC, else test AUROC"""
         best_models = {}
         
         # Best Logistic Regression (only one)
         if 'logistic_regression' in self.results:
             best_models['logistic_regression'] = self.results['logistic_regression']
+        if 'incremental_logistic_regression' in self.results:
+            best_models['incremental_logistic_regression'] = self.results['incremental_logistic_regression']
         
         # Best Random Forest
         rf_models = {k: v for k, v in self.results.items() if k.startswith('random_forest')}
         if rf_models:
-            best_rf_name = max(rf_models.keys(), key=lambda x: rf_models[x]['test_auroc'])
+            best_rf_name = max(rf_models.keys(), key=self._selection_score)
             best_models['best_random_forest'] = rf_models[best_rf_name]
             best_models['best_random_forest']['model_name'] = best_rf_name
         
         # Best SVM
         svm_models = {k: v for k, v in self.results.items() if k.startswith('svm')}
         if svm_models:
-            best_svm_name = max(svm_models.keys(), key=lambda x: svm_models[x]['test_auroc'])
+            best_svm_name = max(svm_models.keys(), key=self._selection_score)
             best_models['best_svm'] = svm_models[best_svm_name]
             best_models['best_svm']['model_name'] = best_svm_name
         
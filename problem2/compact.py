@@ -0,0 +1,64 @@
+"""
+Compact float32 feature pipeline with mean imputation and standardization
+
+The default path keeps the float64 feature matrices and makes a scaled
+float64 copy of each for the SVMs. The compact path produces one float32
+matrix per split instead: it is standardized in place, and every model
+uses it. Missing values (NaN) are imputed with the training mean, and an
+indicator column can be added for each feature that has missing values.
+Input is read a block of rows at a time, so no float64 temporary larger
+than a block exists.
+"""
+import numpy as np
+
+from icu_cache import streaming_moments
+
+class CompactPreprocessor:
+    """Mean imputation, standardization and optional missing indicators, in float32
+
+    fit() takes each column's mean over its observed values. Its scale is
+    the standard deviation of the column after mean imputation, which is
+    what StandardScaler would see on the imputed matrix. Both come from one
+    blockwise pass in float64 (icu_cache.streaming_moments).
+    """
+
+    def __init__(self, missing_indicators=False, block_rows=2048):
+        self.missing_indicators = missing_indicators
+        self.block_rows = block_rows
+
+    def _blocks(self, n_rows):
+        for start in range(0, n_rows, self.block_rows):
+            yield slice(start, min(start + self.block_rows, n_rows))
+
+    def fit(self, X):
+        n_rows, n_features = X.shape
+        observed, mean, m2 = streaming_moments(X, self.block_rows, ignore_nan=True)
+        scale = np.sqrt(m2 / n_rows)
+        scale[scale == 0] = 1.0
+        self.mean_ = mean
+        self.scale_ = scale
+        self.n_features_in_ = n_features
+        self.missing_columns_ = (np.flatnonzero(observed < n_rows) if self.missing_indicators
+                                 else np.array([], dtype=np.intp))
+        return self
+
+    def transform(self, X):
+        """New float32 array: standardized features, then the indicator columns"""
+        n_rows, n_features = X.shape
+        out = np.empty((n_rows, n_features + len(self.missing_columns_)), dtype=np.float32)
+        mean = self.mean_.astype(np.float32)
+        inverse_scale = (1 / self.scale_).astype(np.float32)
+        for rows in self._blocks(n_rows):
+            block = out[rows, :n_features]
+            block[...] = X[rows]
+            missing = np.isnan(block)
+            block -= mean
+            block *= inverse_scale
+            # The training mean standardizes to zero
+            np.copyto(block, 0, where=missing)
+            if len(self.missing_columns_):
+                out[rows, n_features:] = missing[:, self.missing_columns_]
+        return out
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
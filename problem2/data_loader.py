@@ -1,39 +1,100 @@
 """
 Data loading utilities for ICU dataset from Physionet 2012 challenge
 """
+from functools import cached_property
+
 import numpy as np
 import pandas as pd
 
-def load_icu_data():
-    """Load the ICU training and testing datasets from npz files"""
-    
+from icu_cache import cached_stats, load_array, streaming_stats
+
+TRAIN_FILE = 'hw1_train.data.npz'
+TEST_FILE = 'hw1_test.data.npz'
+
+class ICUDataset:
+    """Train and test arrays, memory-mapped from .npy sidecars on first access
+
+    Nothing is read when the dataset is created; each array is opened the
+    first time its attribute is used, and its pages are only loaded as the
+    data is touched.
+    """
+
+    def __init__(self, train_file=TRAIN_FILE, test_file=TEST_FILE):
+        self.train_file = train_file
+        self.test_file = test_file
+
+    @cached_property
+    def X_train(self):
+        return load_array(self.train_file, 'X_train')
+
+    @cached_property
+    def y_train(self):
+        return load_array(self.train_file, 'y_train')
+
+    @cached_property
+    def X_test(self):
+        return load_array(self.test_file, 'X_test')
+
+    @cached_property
+    def y_test(self):
+        return load_array(self.test_file, 'y_test')
+
+    def feature_stats(self):
+        """Per-feature mean and std of both splits, cached next to the data"""
+        train_mean, train_std = cached_stats(self.train_file, 'X_train')
+        test_mean, test_std = cached_stats(self.test_file, 'X_test')
+        return {
+            'train_mean': train_mean,
+            'train_std': train_std,
+            'test_mean': test_mean,
+            'test_std': test_std
+        }
+
+def load_icu_data(use_cache=True):
+    """Load the ICU training and testing datasets from npz files
+
+    With use_cache the arrays are memory-mapped from .npy sidecars (written
+    on the first run) instead of being decompressed from the npz each time.
+    """
+    if use_cache:
+        dataset = ICUDataset()
+        return dataset.X_train, dataset.y_train, dataset.X_test, dataset.y_test
+
     # Load training data
-    train_data = np.load('hw1_train.data.npz')
+    train_data = np.load(TRAIN_FILE)
     train_features = train_data['X_train']
     train_labels = train_data['y_train']
-    
-    # Load testing data  
-    test_data = np.load('hw1_test.data.npz')
+
+    # Load testing data
+    test_data = np.load(TEST_FILE)
     test_features = test_data['X_test']
     test_labels = test_data['y_test']
-    
+
     return train_features, train_labels, test_features, test_labels
 
-def explore_dataset(train_features, train_labels, test_features, test_labels):
-    """Explore the dataset structure and characteristics"""
-    
+def explore_dataset(train_features, train_labels, test_features, test_labels, feature_stats=None):
+    """Explore the dataset structure and characteristics
+
+    feature_stats can be passed in (see ICUDataset.feature_stats); otherwise
+    the means and standard deviations come from one streaming pass per split.
+    """
+    if feature_stats is None:
+        train_mean, train_std = streaming_stats(train_features)
+        test_mean, test_std = streaming_stats(test_features)
+        feature_stats = {
+            'train_mean': train_mean,
+            'train_std': train_std,
+            'test_mean': test_mean,
+            'test_std': test_std
+        }
+
     dataset_info = {
         'train_samples': train_features.shape[0],
         'test_samples': test_features.shape[0],
         'n_features': train_features.shape[1],
         'train_positive_ratio': np.mean(train_labels),
         'test_positive_ratio': np.mean(test_labels),
-        'feature_stats': {
-            'train_mean': np.mean(train_features, axis=0),
-            'train_std': np.std(train_features, axis=0),
-            'test_mean': np.mean(test_features, axis=0),
-            'test_std': np.std(test_features, axis=0)
-        }
+        'feature_stats': feature_stats
     }
-    
-    return dataset_info
\ No newline at end of file
+
+    return dataset_info
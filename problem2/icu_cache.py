@@ -0,0 +1,143 @@
+"""
+Uncompressed .npy sidecars for the ICU npz files
+
+np.load on an npz decompresses and copies every array it is asked for. The
+first load here writes each array of the npz as a plain .npy file in a
+sidecar directory next to the source; later loads memory-map those files,
+so pages are only read when the data is actually touched. The sidecar is
+rebuilt when the npz changes size or mtime.
+
+Per-feature mean and standard deviation are computed in one streaming pass
+(Welford's update, merged a block of rows at a time) and stored in the
+sidecar as well.
+"""
+import os
+
+import numpy as np
+
+from json_files import read_json, write_json
+
+CACHE_DIR = '.icu_cache'
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+STATS_FILE = 'stats_{name}.npz'
+
+
+def sidecar_path(filename):
+    """Sidecar directory used for a given npz file"""
+    source_dir, source_name = os.path.split(os.path.abspath(filename))
+    return os.path.join(source_dir, CACHE_DIR, source_name)
+
+def write_sidecar(filename, sidecar_dir=None):
+    """Store every array of an npz file as an uncompressed .npy file"""
+    sidecar_dir = sidecar_dir or sidecar_path(filename)
+    os.makedirs(sidecar_dir, exist_ok=True)
+    stat = os.stat(filename)
+
+    arrays = {}
+    with np.load(filename) as source:
+        for name in source.files:
+            path = os.path.join(sidecar_dir, f'{name}.npy')
+            # Save under a temporary name so a crash never leaves a truncated array
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, source[name])
+            os.replace(path + '.tmp', path)
+            arrays[name] = f'{name}.npy'
+
+    for name in os.listdir(sidecar_dir):
+        if name.startswith('stats_'):
+            os.remove(os.path.join(sidecar_dir, name))
+
+    meta = {'version': CACHE_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'arrays': arrays}
+    write_json(os.path.join(sidecar_dir, META_FILE), meta)
+    return meta
+
+def open_sidecar(filename):
+    """Sidecar directory and manifest for an npz, (re)building it if stale"""
+    sidecar_dir = sidecar_path(filename)
+    meta = read_json(os.path.join(sidecar_dir, META_FILE))
+    stat = os.stat(filename)
+    if (meta is None or meta.get('version') != CACHE_VERSION
+            or meta['size'] != stat.st_size or meta['mtime_ns'] != stat.st_mtime_ns):
+        meta = write_sidecar(filename, sidecar_dir)
+    return sidecar_dir, meta
+
+def load_array(filename, name):
+    """Memory-mapped array from the npz's sidecar, read-only
+
+    Falls back to a plain npz load if the sidecar cannot be written (for
+    example a read-only data directory).
+    """
+    try:
+        sidecar_dir, meta = open_sidecar(filename)
+    except OSError:
+        with np.load(filename) as source:
+            return source[name]
+    return np.load(os.path.join(sidecar_dir, meta['arrays'][name]), mmap_mode='r')
+
+def streaming_moments(X, block_rows=65536, ignore_nan=False):
+    """Per-column count, mean and sum of squared deviations (M2) in one pass over X
+
+    Rows are consumed a block at a time and merged into the running totals
+    (Chan et al.), so only one float64 copy of a block is ever resident.
+    With ignore_nan, NaNs are left out of each column's count, mean and M2.
+    """
+    n_features = X.shape[1]
+    count = np.zeros(n_features)
+    mean = np.zeros(n_features)
+    m2 = np.zeros(n_features)
+    for start in range(0, X.shape[0], block_rows):
+        # The block copy is reused in place for both moments
+        block = np.array(X[start:start + block_rows], dtype=np.float64)
+        missing = np.isnan(block) if ignore_nan else None
+        if missing is not None:
+            block[missing] = 0
+            block_count = len(block) - np.sum(missing, axis=0)
+        else:
+            block_count = np.full(n_features, len(block))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block_mean = np.nan_to_num(block.sum(axis=0) / block_count)
+        block -= block_mean
+        if missing is not None:
+            block[missing] = 0
+        block *= block
+        block_m2 = block.sum(axis=0)
+
+        total = count + block_count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, block_count / total, 0)
+        delta = block_mean - mean
+        mean = mean + delta * weight
+        m2 = m2 + block_m2 + delta ** 2 * count * weight
+        count = total
+    return count, mean, m2
+
+def streaming_stats(X, block_rows=65536):
+    """Column mean and population standard deviation in one pass over X"""
+    count, mean, m2 = streaming_moments(X, block_rows)
+    return mean, np.sqrt(m2 / count)
+
+def cached_stats(filename, name):
+    """streaming_stats for one array of an npz, stored in its sidecar"""
+    try:
+        sidecar_dir, _ = open_sidecar(filename)
+    except OSError:
+        with np.load(filename) as source:
+            return streaming_stats(source[name])
+
+    path = os.path.join(sidecar_dir, STATS_FILE.format(name=name))
+    try:
+        with np.load(path) as stats:
+            return stats['mean'], stats['std']
+    except (OSError, KeyError, ValueError):
+        pass
+
+    mean, std = streaming_stats(load_array(filename, name))
+    try:
+        with open(path + '.tmp', 'wb') as f:
+            np.savez(f, mean=mean, std=std)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+    return mean, std
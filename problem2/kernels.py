@@ -0,0 +1,94 @@
+"""
+Pure-NumPy inference kernels for the fitted ICU models
+
+predict_proba on sklearn estimators validates its input and, for forests,
+dispatches one call per tree, which dominates the latency of scoring a
+single patient. The kernels here keep only the arithmetic:
+
+- LinearKernel: one matrix product and a sigmoid
+- ForestKernel: all trees flattened into contiguous node arrays and
+  traversed together, one vectorized step per tree level
+
+Both reproduce the estimator's positive-class probability bit for bit: the
+same float32 cast and split comparisons as sklearn's trees, per-tree
+probabilities added in tree order and divided by the number of trees.
+"""
+import numpy as np
+from scipy.special import expit
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+class LinearKernel:
+    """Binary logistic regression as X @ coef + intercept followed by expit"""
+
+    def __init__(self, model):
+        # Kept as a column so the product is the same matmul sklearn runs
+        self.coef = np.ascontiguousarray(model.coef_.T)
+        self.intercept = model.intercept_.copy()
+
+    def predict_proba(self, X):
+        """Probability of the positive class for each row of X"""
+        # In the coefficients' dtype, as sklearn does for models fitted on float32
+        X = np.atleast_2d(np.asarray(X, dtype=self.coef.dtype))
+        return expit((X @ self.coef + self.intercept).reshape(-1))
+
+class ForestKernel:
+    """Random forest with every tree packed into one set of node arrays
+
+    Leaves point to themselves, so traversal runs a fixed number of steps
+    (the deepest tree's depth) for all trees and rows at once.
+    """
+
+    def __init__(self, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+        self.n_trees = len(trees)
+        self.depth = max(tree.max_depth for tree in trees)
+        self.roots = offsets[:-1].astype(np.intp)
+
+        feature, threshold, left, right, missing_left, value = [], [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            missing_left.append(tree.missing_go_to_left.astype(bool))
+            # value holds class fractions per node; column 1 is the positive class
+            value.append(tree.value[:, 0, 1])
+
+        self.feature = np.concatenate(feature).astype(np.intp)
+        self.threshold = np.concatenate(threshold)
+        self.left = np.concatenate(left).astype(np.intp)
+        self.right = np.concatenate(right).astype(np.intp)
+        self.missing_left = np.concatenate(missing_left)
+        self.value = np.concatenate(value)
+
+    def apply(self, X):
+        """Leaf index of every (tree, row) pair, shape (n_trees, n_rows)"""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        rows = np.arange(X.shape[0])
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self.depth):
+            x = X[rows, self.feature[nodes]]
+            go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Probability of the positive class for each row of X"""
+        per_tree = self.value[self.apply(X)]
+        # cumsum adds strictly in tree order, as the forest's accumulation loop does
+        return np.cumsum(per_tree, axis=0)[-1] / self.n_trees
+
+def compile_model(model):
+    """Kernel for a fitted binary model, or None if it has no NumPy version"""
+    if len(getattr(model, 'classes_', ())) != 2:
+        return None
+    if isinstance(model, LogisticRegression):
+        return LinearKernel(model)
+    if isinstance(model, RandomForestClassifier):
+        return ForestKernel(model)
+    return None
@@ -1,44 +1,131 @@
 """
 Main script to run ICU mortality prediction analysis with multiple classifiers
 """
+import argparse
 import sys
 import os
 
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root for the shared instrumentation module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from data_loader import load_icu_data, explore_dataset
+from instrumentation import PROFILER
+from data_loader import ICUDataset, explore_dataset
 from classifiers import ICUClassifiers
+from model_store import save_models
+from training_cache import TrainingCache
 
-def main():
+def main(n_jobs=1, max_cores=None, extended_metrics=False, save_models_path=None,
+         incremental_chunk_rows=None, search='grid', cache_mb=512, bootstrap_resamples=None,
+         cv_folds=None, compact=False, missing_indicators=False):
     """Run the complete classification analysis pipeline"""
     
-    # Load ICU dataset
-    X_train, y_train, X_test, y_test = load_icu_data()
+    # Load ICU dataset (memory-mapped from .npy sidecars)
+    with PROFILER.stage('load_icu_data') as stage:
+        dataset = ICUDataset()
+        X_train, y_train, X_test, y_test = dataset.X_train, dataset.y_train, dataset.X_test, dataset.y_test
+        stage['rows'] = len(y_train) + len(y_test)
+    n_train, n_all = len(y_train), len(y_train) + len(y_test)
     
-    # Explore dataset characteristics
-    dataset_info = explore_dataset(X_train, y_train, X_test, y_test)
+    # Explore dataset characteristics, with feature statistics cached on disk
+    with PROFILER.stage('explore_dataset', n_all):
+        dataset_info = explore_dataset(X_train, y_train, X_test, y_test, dataset.feature_stats())
     
-    # Initialize classifier container
-    classifiers = ICUClassifiers()
+    # Initialize classifier container; fits already on disk are loaded, not refitted
+    cache = TrainingCache(max_bytes=cache_mb * 2**20) if cache_mb else None
+    classifiers = ICUClassifiers(n_jobs=n_jobs, max_cores=max_cores,
+                                 extended_metrics=extended_metrics, search=search, cache=cache)
     
-    # Prepare scaled data for SVM
-    X_train_scaled, X_test_scaled = classifiers.prepare_data(X_train, y_train, X_test, y_test)
+    # Prepare scaled data for SVM, or one compact float32 matrix per split for all models
+    n_features = X_train.shape[1]
+    with PROFILER.stage('prepare_data', n_all):
+        if compact:
+            X_train, X_test = classifiers.prepare_compact(X_train, X_test, missing_indicators)
+            X_train_scaled, X_test_scaled = X_train, X_test
+        else:
+            X_train_scaled, X_test_scaled = classifiers.prepare_data(X_train, y_train, X_test, y_test)
+    
+    # k-fold CV on the training set, used to pick the best models when given
+    if cv_folds:
+        with PROFILER.stage('cross_validate', n_train * cv_folds):
+            classifiers.cross_validate(X_train, y_train, cv_folds)
     
     # Train Logistic Regression
-    lr_results = classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+    with PROFILER.stage('train_logistic_regression', n_train):
+        lr_results = classifiers.train_logistic_regression(X_train, y_train, X_test, y_test)
+    
+    # Out-of-core SGD logistic regression, reported next to the batch model
+    if incremental_chunk_rows:
+        with PROFILER.stage('train_incremental_logistic', n_train):
+            sgd_results = classifiers.train_incremental_logistic(X_train, y_train, X_test, y_test,
+                                                                 chunk_rows=incremental_chunk_rows)
     
     # Train Random Forest with different parameters
-    rf_results = classifiers.train_random_forest(X_train, y_train, X_test, y_test)
+    with PROFILER.stage('train_random_forest', n_train):
+        rf_results = classifiers.train_random_forest(X_train, y_train, X_test, y_test)
     
     # Train SVM with different parameters
-    svm_results = classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+    with PROFILER.stage('train_svm', n_train):
+        svm_results = classifiers.train_svm(X_train_scaled, y_train, X_test_scaled, y_test)
+    
+    # Bootstrap intervals and paired comparisons from the stored test scores
+    if bootstrap_resamples:
+        with PROFILER.stage('bootstrap_intervals', len(y_test)):
+            classifiers.bootstrap_intervals(y_test, bootstrap_resamples)
     
     # Get all results
     all_results = classifiers.get_all_results()
-    best_models = classifiers.get_best_models()
+    with PROFILER.stage('get_best_models'):
+        best_models = classifiers.get_best_models()
+    
+    # Persist the trained models for scoring_service.py
+    if save_models_path:
+        with PROFILER.stage('save_models'):
+            save_models(classifiers, save_models_path, n_features=n_features)
     
     return all_results, best_models, dataset_info
 
 if __name__ == "__main__":
-    all_results, best_models, dataset_info = main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='ICU mortality prediction')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Fit hyperparameter configurations in N processes (-1: all cores)')
+    parser.add_argument('--max-cores', type=int, default=None,
+                        help='Upper limit on cores used by the sweeps')
+    parser.add_argument('--extended-metrics', action='store_true',
+                        help='Also report PR-AUC, Brier score and calibration bins')
+    parser.add_argument('--save-models', metavar='PATH', default=None,
+                        help='Write the trained models and scaler to PATH for scoring_service.py')
+    parser.add_argument('--incremental', metavar='CHUNK_ROWS', type=int, default=None,
+                        help='Also train the SGD logistic model on chunks of CHUNK_ROWS rows')
+    parser.add_argument('--search', choices=['grid', 'halving'], default='grid',
+                        help='Fit the full grids or explore them by successive halving')
+    parser.add_argument('--compact', action='store_true',
+                        help='Train on one imputed, standardized float32 matrix per split')
+    parser.add_argument('--missing-indicators', action='store_true',
+                        help='With --compact, add a 0/1 column for each feature with missing values')
+    parser.add_argument('--cv', metavar='FOLDS', type=int, default=None,
+                        help='Select the best models by k-fold cross-validation on the training set')
+    parser.add_argument('--bootstrap', metavar='N_RESAMPLES', type=int, default=None,
+                        help='Add bootstrap intervals and paired AUROC tests to the results')
+    parser.add_argument('--cache-size-mb', type=int, default=512,
+                        help='Size limit of the fitted-model cache in .icu_cache/models')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Fit every model instead of loading unchanged ones from the cache')
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='Record per-stage time and memory to PATH (*.json: Chrome trace, '
+                             'otherwise JSON lines)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also trace allocations per stage (slower)')
+    args = parser.parse_args()
+    
+    if args.profile:
+        PROFILER.enable(trace_memory=args.profile_memory)
+    all_results, best_models, dataset_info = main(args.jobs, args.max_cores, args.extended_metrics,
+                                                  args.save_models, args.incremental, args.search,
+                                                  0 if args.no_cache else args.cache_size_mb,
+                                                  args.bootstrap, args.cv, args.compact,
+                                                  args.missing_indicators)
+    if args.profile:
+        PROFILER.write(args.profile)
+        print(PROFILER.summary())
\ No newline at end of file
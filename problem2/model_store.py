@@ -0,0 +1,35 @@
+"""
+Saving and loading trained ICU models together with their scaler
+"""
+import joblib
+import sklearn
+
+STORE_VERSION = 1
+
+def save_models(classifiers, path, n_features):
+    """Persist ICUClassifiers.models, the fitted scaler and the results
+
+    SVMs are trained on standardized features, so the bundle records which
+    models expect scaled input; the scorer applies the scaler for them. In
+    the compact pipeline every model does, and the scaler is the
+    CompactPreprocessor.
+    """
+    bundle = {
+        'version': STORE_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'n_features': n_features,
+        'models': classifiers.models,
+        'scaled_models': [name for name in classifiers.models
+                          if classifiers.compact or name.startswith('svm')],
+        'scaler': classifiers.scaler,
+        'results': classifiers.results
+    }
+    joblib.dump(bundle, path)
+    return path
+
+def load_models(path):
+    """Load a bundle written by save_models"""
+    bundle = joblib.load(path)
+    if bundle.get('version') != STORE_VERSION:
+        raise ValueError(f'{path} was written by an unsupported model store version')
+    return bundle
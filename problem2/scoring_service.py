@@ -0,0 +1,242 @@
+"""
+Online scoring of ICU patients with a persisted model
+
+ModelScorer scores feature vectors in-process. MicroBatcher sits in front
+of it for concurrent callers: requests that arrive within a few
+milliseconds of each other are stacked into one vectorized predict_proba
+call. The optional HTTP server exposes the batcher on a local port:
+
+    python scoring_service.py --models icu_models.joblib --model logistic_regression
+
+    POST /score   {"features": [...]} or {"instances": [[...], ...]}
+    GET  /stats   request count and p50/p99 latency in milliseconds
+    GET  /health
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# and the repository root: unpickling a compact model imports icu_cache,
+# which uses the shared json_files module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from kernels import compile_model
+from model_store import load_models
+
+class ModelScorer:
+    """Mortality probabilities from one model of a saved bundle
+
+    Logistic regression and random forests are scored through their NumPy
+    kernel (same probabilities, much lower per-call latency) unless
+    compiled=False.
+    """
+
+    def __init__(self, bundle, model_name, compiled=True):
+        self.model_name = model_name
+        self.model = bundle['models'][model_name]
+        self.scaler = bundle['scaler'] if model_name in bundle['scaled_models'] else None
+        self.n_features = bundle['n_features']
+        self.kernel = compile_model(self.model) if compiled else None
+        if not hasattr(self.model, 'predict_proba'):
+            raise ValueError(f'{model_name} has no probability output '
+                             '(only the calibrated best SVM does)')
+
+    def predict_proba(self, X):
+        """Probability of mortality for each row of X"""
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        if X.shape[1] != self.n_features:
+            raise ValueError(f'expected {self.n_features} features, got {X.shape[1]}')
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        if self.kernel is not None:
+            return self.kernel.predict_proba(X)
+        return self.model.predict_proba(X)[:, 1]
+
+class LatencyTracker:
+    """Keeps the most recent request latencies for percentile reporting"""
+
+    def __init__(self, window=10000):
+        self.latencies = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+        self.count += 1
+
+    def summary(self):
+        if not self.latencies:
+            return {'requests': 0, 'p50_ms': None, 'p99_ms': None}
+        p50, p99 = np.percentile(np.fromiter(self.latencies, float), [50, 99]) * 1000
+        return {'requests': self.count, 'p50_ms': float(p50), 'p99_ms': float(p99)}
+
+class MicroBatcher:
+    """Groups concurrent score requests into vectorized predict_proba calls
+
+    A batch is sent as soon as max_batch_size requests are waiting or the
+    oldest one has waited max_wait_ms. Scoring runs in a worker thread so
+    the event loop keeps accepting requests meanwhile.
+    """
+
+    def __init__(self, scorer, max_batch_size=64, max_wait_ms=2.0):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.latency = LatencyTracker()
+        self.batch_sizes = LatencyTracker()
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+    async def score(self, features):
+        """Probability for one patient, batched with concurrent requests
+
+        A vector of the wrong shape raises ValueError here, before it is
+        queued, so it cannot fail the batch it would have been stacked into.
+        """
+        features = np.asarray(features, dtype=float)
+        if features.shape != (self.scorer.n_features,):
+            raise ValueError(f'expected {self.scorer.n_features} features, got shape {features.shape}')
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future, time.perf_counter()))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                features = np.vstack([item[0] for item in batch])
+                probabilities = await loop.run_in_executor(None, self.scorer.predict_proba, features)
+            except Exception as error:
+                # Fail this batch's requests only; the worker keeps serving
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            now = time.perf_counter()
+            self.batch_sizes.record(len(batch))
+            for (_, future, started), probability in zip(batch, probabilities):
+                if not future.done():
+                    future.set_result(float(probability))
+                self.latency.record(now - started)
+
+    def stats(self):
+        stats = self.latency.summary()
+        stats['mean_batch_size'] = (float(np.mean(self.batch_sizes.latencies))
+                                    if self.batch_sizes.latencies else None)
+        return stats
+
+async def _read_request(reader):
+    """Parse one HTTP/1.1 request; returns (method, path, body) or None at EOF"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, path, body
+
+def _response(status, payload):
+    body = json.dumps(payload).encode()
+    head = (f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n')
+    return head.encode('latin-1') + body
+
+async def _handle(batcher, method, path, body):
+    if method == 'GET' and path == '/health':
+        return _response('200 OK', {'status': 'ok', 'model': batcher.scorer.model_name,
+                                     'n_features': batcher.scorer.n_features})
+    if method == 'GET' and path == '/stats':
+        return _response('200 OK', batcher.stats())
+    if method == 'POST' and path == '/score':
+        try:
+            request = json.loads(body)
+            if 'instances' in request:
+                scores = await asyncio.gather(*[batcher.score(x) for x in request['instances']])
+                return _response('200 OK', {'probabilities': scores})
+            return _response('200 OK', {'probability': await batcher.score(request['features'])})
+        except (ValueError, KeyError, TypeError) as error:
+            return _response('400 Bad Request', {'error': str(error)})
+    return _response('404 Not Found', {'error': f'no route for {method} {path}'})
+
+async def serve(batcher, host='127.0.0.1', port=8080):
+    """Run the HTTP front end until cancelled"""
+    async def on_connection(reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                writer.write(await _handle(batcher, *request))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    await batcher.start()
+    server = await asyncio.start_server(on_connection, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve ICU mortality scores over HTTP')
+    parser.add_argument('--models', required=True, help='Bundle written by model_store.save_models')
+    parser.add_argument('--model', default='logistic_regression', help='Model name in the bundle')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--no-kernels', action='store_true',
+                        help='Score with sklearn predict_proba instead of the NumPy kernels')
+    args = parser.parse_args()
+
+    scorer = ModelScorer(load_models(args.models), args.model, compiled=not args.no_kernels)
+    batcher = MicroBatcher(scorer, args.max_batch_size, args.max_wait_ms)
+    print(f'Serving {args.model} on http://{args.host}:{args.port}')
+    try:
+        asyncio.run(serve(batcher, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
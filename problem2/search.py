@@ -0,0 +1,44 @@
+"""
+Successive halving over hyperparameter candidates
+
+Every surviving candidate is scored at a small budget (training rows or
+trees), the best 1/factor of them move on to a budget factor times larger,
+and so on up to the full budget. Losing configurations are dropped after
+their cheapest evaluation instead of being fitted to completion.
+"""
+import math
+
+def halving_budgets(max_budget, n_candidates, factor=3, min_budget=1):
+    """Increasing budgets ending at max_budget, one rung per halving step
+
+    As in sklearn's HalvingGridSearchCV, the rungs narrow n_candidates down
+    to at most factor candidates at the full budget, so the final choice is
+    still made between fully trained models. No rung goes below min_budget.
+    """
+    n_rungs = int(math.log(n_candidates, factor) + 1e-9) if n_candidates > 1 else 0
+    if min_budget < max_budget:
+        n_rungs = min(n_rungs, int(math.log(max_budget / min_budget, factor)))
+    else:
+        n_rungs = 0
+    return [max_budget // factor ** k for k in range(n_rungs, 0, -1)] + [max_budget]
+
+def successive_halving(candidates, budgets, score, factor=3, min_survivors=1):
+    """Run the halving rungs and return (survivors, history)
+
+    score(candidate, budget) returns a higher-is-better number. After each
+    rung but the last, the top ceil(n / factor) candidates are kept, and
+    never fewer than min_survivors. The
+    survivors are the candidates evaluated at the final budget, best first;
+    history maps each candidate to its [(budget, score), ...] evaluations.
+    """
+    history = {candidate: [] for candidate in candidates}
+    survivors = list(candidates)
+    for rung, budget in enumerate(budgets):
+        scores = {candidate: score(candidate, budget) for candidate in survivors}
+        for candidate in survivors:
+            history[candidate].append((budget, scores[candidate]))
+        # Stable sort keeps grid order among ties, like max() over the grid
+        survivors = sorted(survivors, key=lambda candidate: -scores[candidate])
+        if rung < len(budgets) - 1:
+            survivors = survivors[:max(min_survivors, math.ceil(len(survivors) / factor))]
+    return survivors, history
@@ -0,0 +1,113 @@
+"""
+Content-addressed cache of fitted ICU models and their metrics
+
+A fit is identified by a hash of the arrays it saw, the estimator class,
+its parameters, whether extended metrics were computed and the library
+versions. The fitted model, its results dict, test scores and test
+predictions are stored under that hash with joblib, so a rerun on
+unchanged data loads every unchanged configuration instead of refitting
+it. Entries are evicted least recently used first once the directory
+grows past max_bytes.
+"""
+import hashlib
+import json
+import os
+import sys
+
+import joblib
+import numpy as np
+import sklearn
+
+CACHE_VERSION = 2
+DEFAULT_DIR = os.path.join('.icu_cache', 'models')
+
+def array_digest(*arrays):
+    """SHA-256 over the dtype, shape and contents of each array"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+class TrainingCache:
+    """Directory of joblib files named by the hash of what produced them"""
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=512 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, estimator_class, estimator_params, data_digest, **extra):
+        description = {
+            'version': CACHE_VERSION,
+            'estimator': f'{estimator_class.__module__}.{estimator_class.__qualname__}',
+            'params': estimator_params,
+            'data': data_digest,
+            'extra': extra,
+            'sklearn': sklearn.__version__,
+            'numpy': np.__version__,
+            'python': sys.version_info[:2]
+        }
+        encoded = json.dumps(description, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.joblib')
+
+    def get(self, key):
+        """Stored value for key, or None"""
+        path = self._path(key)
+        try:
+            value = joblib.load(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # A truncated or corrupt entry can fail in many ways (struct.error,
+            # UnpicklingError, ...); drop it so the refit replaces it
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.misses += 1
+            return None
+        # Mark as recently used for eviction
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value under key, then evict old entries beyond max_bytes"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            joblib.dump(value, path + '.tmp')
+            os.replace(path + '.tmp', path)
+            self.evict()
+        except OSError:
+            # A read-only or full disk only costs the refit next time
+            pass
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.joblib'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def cached(self, key, compute):
+        """Return the stored value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value